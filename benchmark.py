@@ -0,0 +1,297 @@
+import argparse
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+
+from constants import GRID_SIZE, NUMCELLS_R, MAX_LIFE_C, MAX_LIFE_E
+from creatures import Erbast, Carviz
+from instrumentation import TickRecorder
+from simulation_data_manager import SimulationParameters
+from simulation_engine import SimulationEngine
+from sweep import _pool_context
+from world_state import WorldState
+
+SIZES = (GRID_SIZE, 100, 250, 500, NUMCELLS_R)
+# Creatures per cell; carviz are seeded at half the erbast density.
+DENSITIES = {"low": 0.005, "medium": 0.02, "high": 0.08}
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    `allocated_kib_per_tick` and `allocated_blocks_per_tick` add up, per
+    allocating source line, the growth between tracemalloc snapshots
+    taken before and after a tick: what the tick allocated and still
+    held at its end. Temporaries freed within the tick only show in
+    `peak_growth_kib_per_tick`, how far the traced peak rose above the
+    memory traced when the tick began.
+    """
+
+    size: int
+    density: str
+    seed: int
+    ticks: int
+    initialize_seconds: float
+    ticks_per_second: float
+    phase_seconds: dict
+    statistics_seconds: float
+    snapshot_seconds: float
+    allocated_kib_per_tick: float
+    allocated_blocks_per_tick: float
+    peak_growth_kib_per_tick: float
+    peak_rss_kib: int
+
+    @property
+    def key(self):
+        return f"{self.size}/{self.density}"
+
+
+@dataclass
+class MemoryResult:
+    creatures: int
+    cells: int
+    bytes_per_erbast: float
+    bytes_per_carviz: float
+    bytes_per_cell: float
+
+
+def _parameters(size, density):
+    erbast = max(1, int(size * size * DENSITIES[density]))
+    return SimulationParameters(
+        animation_speed=0,
+        grid_size=size,
+        initial_carviz_count=max(1, erbast // 2),
+        initial_erbast_count=erbast,
+        carviz_lifespan=MAX_LIFE_C,
+        erbast_lifespan=MAX_LIFE_E,
+        water_coverage=10,
+    )
+
+
+def _new_engine(size, density, seed, ticks):
+    engine = SimulationEngine(
+        _parameters(size, density), max_days=3 * ticks + 8, seed=seed
+    )
+    start = time.perf_counter()
+    engine.initialize()
+    return engine, time.perf_counter() - start
+
+
+def _peak_rss_kib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _run_scenario(task):
+    """
+    Measures one size/density pair in a fresh worker process, so peak RSS
+    belongs to this scenario alone. The same seeded world is rebuilt for
+    the plain, the instrumented and the tracemalloc pass.
+    """
+    size, density, seed, ticks = task
+    engine, initialize_seconds = _new_engine(size, density, seed, ticks)
+
+    controller = engine.simulation_controller
+    simulate_seconds = statistics_seconds = snapshot_seconds = 0.0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        controller.simulate(engine.grid)
+        simulate_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        engine.update_population_statistics()
+        engine._update_simulation_data()
+        statistics_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        engine.snapshot()
+        snapshot_seconds += time.perf_counter() - start
+
+    engine, _ = _new_engine(size, density, seed, ticks)
+    recorder = TickRecorder()
+    engine.instrument(recorder)
+    for _ in range(ticks):
+        engine.step()
+
+    engine, _ = _new_engine(size, density, seed, ticks)
+    allocation_ticks = min(ticks, 3)
+    allocated_bytes = allocated_blocks = peak_growth = 0
+    tracemalloc.start()
+    for _ in range(allocation_ticks):
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        engine.step()
+        peak_growth += tracemalloc.get_traced_memory()[1] - before
+        for stat in tracemalloc.take_snapshot().compare_to(
+            snapshot, "lineno"
+        ):
+            allocated_bytes += max(stat.size_diff, 0)
+            allocated_blocks += max(stat.count_diff, 0)
+    tracemalloc.stop()
+
+    return BenchmarkResult(
+        size=size,
+        density=density,
+        seed=seed,
+        ticks=ticks,
+        initialize_seconds=initialize_seconds,
+        ticks_per_second=(
+            ticks / simulate_seconds if simulate_seconds else 0.0
+        ),
+        phase_seconds={
+            phase: seconds / ticks
+            for phase, seconds in recorder.phase_totals.items()
+        },
+        statistics_seconds=statistics_seconds / ticks,
+        snapshot_seconds=snapshot_seconds / ticks,
+        allocated_kib_per_tick=allocated_bytes / allocation_ticks / 1024,
+        allocated_blocks_per_tick=allocated_blocks / allocation_ticks,
+        peak_growth_kib_per_tick=peak_growth / allocation_ticks / 1024,
+        peak_rss_kib=_peak_rss_kib(),
+    )
+
+
+def run_benchmarks(
+    sizes=SIZES, densities=tuple(DENSITIES), seed=1, ticks=20
+):
+    """Yields one BenchmarkResult per size/density pair, smallest first."""
+    for size in sizes:
+        for density in densities:
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=_pool_context()
+            ) as executor:
+                yield executor.submit(
+                    _run_scenario, (size, density, seed, ticks)
+                ).result()
+
+
+def _traced_bytes(build):
+    before, _ = tracemalloc.get_traced_memory()
+    keep = build()
+    after, _ = tracemalloc.get_traced_memory()
+    return after - before, keep
+
+
+def measure_memory(creatures=100000, size=300):
+    """
+    Bytes allocated per Erbast, per Carviz and per ground Cell (with its
+    Vegetob, Herd and Pride), as traced by tracemalloc.
+    """
+    tracemalloc.start()
+    try:
+        erbast_bytes, _ = _traced_bytes(
+            lambda: [Erbast() for _ in range(creatures)]
+        )
+        carviz_bytes, _ = _traced_bytes(
+            lambda: [Carviz() for _ in range(creatures)]
+        )
+        world = WorldState(size, size)
+        cell_bytes, _ = _traced_bytes(
+            lambda: world.to_grid(with_creatures=False)
+        )
+    finally:
+        tracemalloc.stop()
+    return MemoryResult(
+        creatures=creatures,
+        cells=size * size,
+        bytes_per_erbast=erbast_bytes / creatures,
+        bytes_per_carviz=carviz_bytes / creatures,
+        bytes_per_cell=cell_bytes / (size * size),
+    )
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Returns a message for every scenario whose ticks/sec dropped by more
+    than `threshold` percent against the baseline entries.
+    """
+    previous = {
+        f"{entry['size']}/{entry['density']}": entry for entry in baseline
+    }
+    regressions = []
+    for result in results:
+        entry = previous.get(result.key)
+        if entry is None or not entry["ticks_per_second"]:
+            continue
+        change = 100 * (
+            result.ticks_per_second / entry["ticks_per_second"] - 1
+        )
+        if change < -threshold:
+            regressions.append(
+                "{}: {:.1f} -> {:.1f} ticks/s ({:+.1f}%)".format(
+                    result.key,
+                    entry["ticks_per_second"],
+                    result.ticks_per_second,
+                    change,
+                )
+            )
+    return regressions
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark simulation ticks across world sizes."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument(
+        "--densities",
+        nargs="+",
+        choices=list(DENSITIES),
+        default=list(DENSITIES),
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument(
+        "--output", metavar="PATH", help="write the results as JSON"
+    )
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="JSON results to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="ticks/sec drop in percent reported as a regression",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="report bytes per creature and per cell instead",
+    )
+    return parser.parse_args(argv)
+
+
+def run_benchmark_cli(argv=None):
+    args = parse_arguments(argv)
+    if args.memory:
+        print(json.dumps(asdict(measure_memory())))
+        return 0
+
+    results = []
+    for result in run_benchmarks(
+        args.sizes, args.densities, args.seed, args.ticks
+    ):
+        results.append(result)
+        print(json.dumps(asdict(result)), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            regressions = compare_to_baseline(
+                results, json.load(file), args.threshold
+            )
+        for message in regressions:
+            print("Regression " + message, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmark_cli())
@@ -1,15 +1,27 @@
 from herd import Herd
 from pride import Pride
+from constants import GROUND, WATER
 
 
 class Cell:
-    def __init__(self, row, column, terrain_type, vegetob):
+    __slots__ = (
+        "row",
+        "column",
+        "terrain_type",
+        "terrain",
+        "vegetob",
+        "erbast",
+        "pride",
+    )
+
+    def __init__(self, row, column, terrain_type, vegetob, tracker=None):
         self.row = row
         self.column = column
         self.terrain_type = terrain_type
+        self.terrain = WATER if terrain_type == "Water" else GROUND
         self.vegetob = vegetob
-        self.erbast = Herd(row, column)
-        self.pride = Pride(row, column)
+        self.erbast = Herd(row, column, tracker)
+        self.pride = Pride(row, column, tracker)
 
     def len_of_erbast(self):
         return len(self.erbast)
@@ -26,45 +38,14 @@ class Cell:
     def del_pride(self, pride):
         self.pride.remove(pride)
 
-    def death_from_vegetob(self, list_of_vegetobs):
-        if self.erbast or self.pride:
-            kernel = self._get_kernel(list_of_vegetobs)
-            if len(kernel) == 8:
-                vegetob_full_density_counter = (
-                    self._count_full_density_vegetobs(kernel, list_of_vegetobs)
-                )
-                if vegetob_full_density_counter == 8:
-                    self._clear_creatures()
-
-    def _get_kernel(self, list_of_vegetobs):
-        creature = (
-            self.erbast[0]
-            if self.erbast
-            else self.pride[0] if self.pride else None
-        )
-        return (
-            creature.get_adjacent_cells(self.row, self.column)
-            if creature
-            else []
-        )
-
-    @staticmethod
-    def _count_full_density_vegetobs(kernel, list_of_vegetobs):
-        return sum(
-            1
-            for row, col in kernel
-            if list_of_vegetobs[row][col].vegetob
-            and list_of_vegetobs[row][col].vegetob.density == 100
-        )
-
-    def _clear_creatures(self):
+    def clear_creatures(self):
         if self.erbast:
             self.erbast.clear()
         if self.pride:
             self.pride.clear()
 
     def __str__(self):
-        if self.terrain_type == "Ground":
+        if self.terrain == GROUND:
             return f"({self.row}, {self.column}, {self.terrain_type}, {self.vegetob.density}, {self.erbast}, {self.pride})"
 
         return f"({self.row}, {self.column}, {self.terrain_type}, {self.vegetob}, erbast: {self.erbast}, carviz: {self.pride})"
@@ -0,0 +1,128 @@
+import json
+import random
+from dataclasses import asdict
+
+import numpy as np
+
+from simulation_data_manager import SimulationParameters
+from simulation_engine import SimulationEngine
+from time_series import TimeSeries
+from world_state import WorldState, CreatureTable
+
+CHECKPOINT_VERSION = 1
+CREATURE_FIELDS = CreatureTable.FIELDS
+HISTORY_FIELDS = (
+    "time_history",
+    "erbast_history",
+    "carviz_history",
+    "hunt_history",
+)
+
+
+def save_checkpoint(engine, path, compressed=False):
+    """
+    Writes the full simulation state of `engine` to a single .npz file:
+    terrain, densities, every creature, both RNG states, the day counter
+    and the history buffers. Creatures are stored in grid scan order, so
+    each cell keeps its herd/pride order on restore.
+    """
+    world = engine.world_state()
+    py_version, py_state, py_gauss = random.getstate()
+    _, np_keys, np_pos, np_has_gauss, np_gauss = np.random.get_state()
+
+    arrays = {
+        "version": np.array(CHECKPOINT_VERSION),
+        "parameters": np.array(json.dumps(asdict(engine.parameters))),
+        "max_days": np.array(engine.max_days),
+        "radii": np.array([engine.erbast_radius, engine.carviz_radius]),
+        "double_buffered": np.array(engine.double_buffered),
+        "seed": np.array(-1 if engine.seed is None else engine.seed),
+        "current_day": np.array(engine.current_day),
+        "terrain": world.terrain,
+        "density": world.density,
+        "python_rng": np.array(py_state, dtype=np.int64),
+        "python_rng_meta": np.array(
+            [py_version, np.nan if py_gauss is None else py_gauss]
+        ),
+        "numpy_rng_keys": np_keys,
+        "numpy_rng_meta": np.array([np_pos, np_has_gauss, np_gauss]),
+    }
+    for species, table in (("erbast", world.erbast), ("carviz", world.carviz)):
+        for name in CREATURE_FIELDS:
+            arrays[f"{species}_{name}"] = getattr(table, name)
+    for name in HISTORY_FIELDS:
+        arrays[name] = getattr(engine, name).values
+
+    save = np.savez_compressed if compressed else np.savez
+    save(path, **arrays)
+
+
+def load_checkpoint(path, tiles=None):
+    """
+    Rebuilds a SimulationEngine from a checkpoint written by
+    save_checkpoint. A tiled engine reseeds its tiles from (seed, day),
+    because per-tile RNG streams live in the worker processes.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        if int(data["version"]) != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"Unsupported checkpoint version: {int(data['version'])}"
+            )
+        params = SimulationParameters(**json.loads(str(data["parameters"])))
+        seed = int(data["seed"])
+        radii = data["radii"].tolist() if "radii" in data.files else (1, 1)
+        engine = SimulationEngine(
+            params,
+            max_days=int(data["max_days"]),
+            seed=None if seed < 0 else seed,
+            tiles=tiles,
+            erbast_radius=radii[0],
+            carviz_radius=radii[1],
+            double_buffered=(
+                "double_buffered" in data.files
+                and bool(data["double_buffered"])
+            ),
+        )
+
+        world = WorldState(*data["terrain"].shape)
+        world.terrain[:] = data["terrain"]
+        world.density[:] = data["density"]
+        for species in ("erbast", "carviz"):
+            table = CreatureTable(len(data[f"{species}_row"]))
+            for name in CREATURE_FIELDS:
+                # Checkpoints written before kernels were saved lack them.
+                if f"{species}_{name}" in data.files:
+                    setattr(table, name, data[f"{species}_{name}"])
+            setattr(world, species, table)
+        engine.attach_world(world, with_creatures=True)
+
+        engine.current_day = int(data["current_day"])
+        for name in HISTORY_FIELDS:
+            setattr(engine, name, TimeSeries.from_values(data[name]))
+
+        # Restored last, after everything that may draw from the RNG.
+        py_version, py_gauss = data["python_rng_meta"].tolist()
+        random.setstate(
+            (
+                int(py_version),
+                tuple(data["python_rng"].tolist()),
+                None if np.isnan(py_gauss) else py_gauss,
+            )
+        )
+        np_pos, np_has_gauss, np_gauss = data["numpy_rng_meta"].tolist()
+        np.random.set_state(
+            (
+                "MT19937",
+                data["numpy_rng_keys"],
+                int(np_pos),
+                int(np_has_gauss),
+                np_gauss,
+            )
+        )
+
+    if tiles:
+        engine._start_tiles(
+            None if seed < 0 else (seed, engine.current_day)
+        )
+    engine.update_population_statistics()
+    return engine
@@ -20,3 +20,12 @@ NEIGHBORHOOD_C = 1   # radius of the region that a pride can evaluate to decide
 # Group size limits
 MAX_HERD = 1000      # maximum numerosity of a herd
 MAX_PRIDE = 100      # maximum numerosity of a pride
+
+# Initial placement of creatures
+SEEDING_DISTRIBUTIONS = ("uniform", "clustered")
+SEED_CLUSTERS = 4           # number of clusters for clustered seeding
+SEED_CLUSTER_SPREAD = 0.05  # cluster radius as a fraction of the grid size
+
+# Terrain codes used by the array-backed world state
+GROUND = 0
+WATER = 1
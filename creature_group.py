@@ -0,0 +1,79 @@
+from bisect import bisect_left
+
+
+class CreatureGroup(list):
+    """
+    Base of Herd and Pride: the creatures sharing one cell, in arrival
+    order. Every member gets an increasing arrival stamp; the stamps are
+    kept sorted next to the members, so removal finds a member's index by
+    bisection instead of comparing it against every member. Members keep
+    their order on removal, and loops over a group behave exactly as they
+    do over a plain list.
+
+    Finding the member is O(log k) for a group of k, but closing the gap
+    it leaves still shifts the members behind it, so remove is O(k): one
+    memmove instead of k Python comparisons. Only append, extend, remove
+    and clear keep the stamps in step with the members; the other list
+    mutators raise TypeError.
+    """
+
+    __slots__ = ("row", "column", "tracker", "_positions", "_stamps")
+
+    def __init__(self, row, column, tracker=None):
+        super().__init__()
+        self.row = row
+        self.column = column
+        self.tracker = tracker
+        # id(member) -> arrival stamp, and the stamps in member order.
+        self._positions = None
+        self._stamps = None
+
+    def _population_changed(self, delta):
+        """Reports `delta` arrivals (or departures) to the tracker."""
+
+    def _stamp(self, creature):
+        if self._positions is None:
+            self._positions, self._stamps = {}, []
+        stamp = self._stamps[-1] + 1 if self._stamps else 0
+        self._positions[id(creature)] = stamp
+        self._stamps.append(stamp)
+
+    def append(self, creature):
+        self._stamp(creature)
+        super().append(creature)
+        if self.tracker is not None:
+            self._population_changed(1)
+
+    def extend(self, creatures):
+        size = len(self)
+        for creature in creatures:
+            self._stamp(creature)
+            super().append(creature)
+        if self.tracker is not None and len(self) > size:
+            self._population_changed(len(self) - size)
+
+    def remove(self, creature):
+        if self._positions is None or id(creature) not in self._positions:
+            raise ValueError("creature is not in this group")
+        index = bisect_left(self._stamps, self._positions.pop(id(creature)))
+        del self._stamps[index]
+        list.__delitem__(self, index)
+        if not self._positions:
+            self._positions = self._stamps = None
+        if self.tracker is not None:
+            self._population_changed(-1)
+
+    def clear(self):
+        if self.tracker is not None and self:
+            self._population_changed(-len(self))
+        super().clear()
+        self._positions = self._stamps = None
+
+    def _unsupported(self, *args, **kwargs):
+        raise TypeError(
+            f"{type(self).__name__} only supports append, extend, remove "
+            "and clear"
+        )
+
+    insert = pop = sort = reverse = _unsupported
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _unsupported
@@ -3,58 +3,90 @@ import numpy as np
 
 
 class Creatures:
-    NUM_CELLS = None
+    NO_NEIGHBORS = np.empty((0, 2), dtype=np.int32)
 
-    def __init__(self):
-        self._row = 0
-        self._column = 0
-        self.kernel = np.empty((0, 0), dtype=object)
+    # Creatures are stored in the millions, so they use slots and plain
+    # attributes. `kernel_row`/`kernel_column` name the cell whose
+    # neighbors were last examined; the coordinates live in the
+    # NeighborTable the controller passes to the find_* calls.
+    __slots__ = ("row", "column", "kernel_row", "kernel_column")
 
-    @classmethod
-    def update_num_cells(cls, num_cells):
-        cls.NUM_CELLS = num_cells
+    def __init__(self):
+        self.row = 0
+        self.column = 0
+        self.kernel_row = None
+        self.kernel_column = None
+
+    def examined_neighbors(self, neighbors):
+        """
+        Neighbors, in the NeighborTable `neighbors`, of the cell last
+        examined by a find_* call.
+        """
+        if self.kernel_row is None:
+            return Creatures.NO_NEIGHBORS
+        return neighbors.neighbors(self.kernel_row, self.kernel_column)
+
+    def _neighborhood_query(self, query, compute, cells_list, cache):
+        """
+        Result of `compute(kernel, cells_list, field)` for the current cell,
+        shared through the NeighborhoodCache `cache` by every creature of
+        the same species querying that cell during the phase. `field` is
+        None for a perception radius of 1 (live cell contents are used);
+        for wider radii it holds each cell's window aggregate.
+        """
+        self.kernel_row, self.kernel_column = self.row, self.column
+        if not cache.memoize:
+            return compute(
+                cache.table.neighbors(self.row, self.column), cells_list, None
+            )
+        radius = cache.radii[type(self)]
+        memo = cache.memo(query, radius)
+        key = self.row * cache.columns + self.column
+        result = memo.get(key)
+        if result is None:
+            result = compute(
+                cache.table.neighbors(self.row, self.column),
+                cells_list,
+                cache.fields.get((query, radius)),
+            )
+            memo[key] = result
+        return result
 
     @staticmethod
-    def get_adjacent_cells(row, col):
-        adjacent_cells = []
-        max_row, max_col = Creatures.NUM_CELLS, Creatures.NUM_CELLS
-        for i in range(row - 1, row + 2):
-            for j in range(col - 1, col + 2):
-                if (0 <= i < max_row and 0 <= j < max_col) and (
-                    i != row or j != col
-                ):
-                    adjacent_cells.append([i, j])
-        return np.array(adjacent_cells)
-
-    @property
-    def row(self):
-        return self._row
-
-    @row.setter
-    def row(self, new_row):
-        self._row = new_row
-
-    @property
-    def column(self):
-        return self._column
-
-    @column.setter
-    def column(self, new_column):
-        self._column = new_column
+    def _most_erbast_cells(kernel, list_of_herds, field):
+        max_erbast = 0
+        max_erbast_cells = []
+        for kernel_row, kernel_col in kernel.tolist():
+            if field is None:
+                len_of_erbast = list_of_herds[kernel_row][
+                    kernel_col
+                ].len_of_erbast()
+            else:
+                len_of_erbast = int(field[kernel_row, kernel_col])
+            if len_of_erbast > max_erbast:
+                max_erbast = len_of_erbast
+                max_erbast_cells = [(kernel_row, kernel_col)]
+            elif len_of_erbast == max_erbast:
+                max_erbast_cells.append((kernel_row, kernel_col))
+        return max_erbast_cells
+
+    def find_herd(self, list_of_herds, cache):
+        max_erbast_cells = self._neighborhood_query(
+            "herds", self._most_erbast_cells, list_of_herds, cache
+        )
+        return (
+            np.array(random.choice(max_erbast_cells))
+            if max_erbast_cells
+            else np.array([self.row, self.column])
+        )
 
 
 class Vegetob(Creatures):
+    __slots__ = ("density",)
+
     def __init__(self):
         super().__init__()
-        self._density = 0
-
-    @property
-    def density(self):
-        return self._density
-
-    @density.setter
-    def density(self, new_density):
-        self._density = int(new_density)
+        self.density = 0
 
     @staticmethod
     def generate_density():
@@ -66,22 +98,16 @@ class Vegetob(Creatures):
 
 
 class Erbast(Creatures):
-    def __init__(self, lifetime=10):
+    __slots__ = ("energy", "lifetime", "age", "soc_attitude", "has_moved")
+
+    def __init__(self, lifetime=10, energy=None):
         super().__init__()
-        self._energy = np.random.randint(35, 95)
+        self.energy = np.random.randint(35, 95) if energy is None else energy
         self.lifetime = lifetime
         self.age = 0
         self.soc_attitude = 1
         self.has_moved = False
 
-    @property
-    def energy(self):
-        return self._energy
-
-    @energy.setter
-    def energy(self, new_energy):
-        self._energy = new_energy
-
     def aging(self, list_of_creatures):
         self.age += 1
         if self.energy <= 1.0 or self.age >= self.lifetime:
@@ -90,21 +116,23 @@ class Erbast(Creatures):
             list_of_creatures.remove(self)
         elif self.age % self.lifetime == 0:
             self.energy -= 1
+            list_of_creatures.energy_changed(self)
 
-    def decide_movement(self, list_of_herds, is_soc_attitude_high):
-        movement_coords = self.find_herd(list_of_herds)
+    def decide_movement(self, list_of_herds, is_soc_attitude_high, cache):
+        movement_coords = self.find_herd(list_of_herds, cache)
         if is_soc_attitude_high and self.energy >= 30:
             if np.array_equal(movement_coords, [self.row, self.column]):
-                movement_coords = self.find_food(list_of_herds)
+                movement_coords = self.find_food(list_of_herds, cache)
             if np.array_equal(movement_coords, [self.row, self.column]):
                 if list_of_herds[self.row][self.column].vegetob.density >= 35:
                     return np.array([self.row, self.column])
-                if self.kernel.size > 0:
+                kernel = self.examined_neighbors(cache.table)
+                if kernel.size > 0:
                     return np.array(
-                        self.kernel[np.random.randint(0, len(self.kernel))]
+                        kernel[np.random.randint(0, len(kernel))]
                     )
         else:
-            movement_coords = self.find_food(list_of_herds)
+            movement_coords = self.find_food(list_of_herds, cache)
             if (
                 np.array_equal(movement_coords, [self.row, self.column])
                 and list_of_herds[self.row][self.column].vegetob.density >= 15
@@ -120,43 +148,28 @@ class Erbast(Creatures):
             erb.row, erb.column = self.row, self.column
             list_of_creatures.append(erb)
 
-    def find_herd(self, list_of_herds):
-        self.kernel = self.get_adjacent_cells(self.row, self.column)
-        max_erbast = 0
-        max_erbast_cells = []
-        for kernel_row, kernel_col in self.kernel:
-            if list_of_herds[kernel_row][kernel_col].terrain_type == "Ground":
-                len_of_erbast = list_of_herds[kernel_row][
-                    kernel_col
-                ].len_of_erbast()
-                if len_of_erbast > max_erbast:
-                    max_erbast = len_of_erbast
-                    max_erbast_cells = [(kernel_row, kernel_col)]
-                elif len_of_erbast == max_erbast:
-                    max_erbast_cells.append((kernel_row, kernel_col))
-        return (
-            np.array(random.choice(max_erbast_cells))
-            if max_erbast_cells
-            else np.array([self.row, self.column])
-        )
-
-    def find_food(self, list_of_vegetobs):
-        self.kernel = self.get_adjacent_cells(self.row, self.column)
+    @staticmethod
+    def _densest_cells(kernel, list_of_vegetobs, field):
         max_density = 0
         max_density_cells = []
-        for kernel_row, kernel_col in self.kernel:
-            if (
-                list_of_vegetobs[kernel_row][kernel_col].terrain_type
-                == "Ground"
-            ):
+        for kernel_row, kernel_col in kernel.tolist():
+            if field is None:
                 density = list_of_vegetobs[kernel_row][
                     kernel_col
                 ].vegetob.density
-                if density > max_density:
-                    max_density = density
-                    max_density_cells = [(kernel_row, kernel_col)]
-                elif density == max_density:
-                    max_density_cells.append((kernel_row, kernel_col))
+            else:
+                density = int(field[kernel_row, kernel_col])
+            if density > max_density:
+                max_density = density
+                max_density_cells = [(kernel_row, kernel_col)]
+            elif density == max_density:
+                max_density_cells.append((kernel_row, kernel_col))
+        return max_density_cells
+
+    def find_food(self, list_of_vegetobs, cache):
+        max_density_cells = self._neighborhood_query(
+            "food", self._densest_cells, list_of_vegetobs, cache
+        )
         return (
             np.array(random.choice(max_density_cells))
             if max_density_cells
@@ -167,45 +180,41 @@ class Erbast(Creatures):
         old_row, old_col = self.row, self.column
         new_row, new_col = coordinates
         list_of_vegetobs[old_row][old_col].erbast.remove(self)
-        list_of_vegetobs[new_row][new_col].erbast.append(self)
+        herd = list_of_vegetobs[new_row][new_col].erbast
+        herd.append(self)
         self.row, self.column = new_row, new_col
         self.energy -= 1
+        herd.energy_changed(self)
 
     def graze(self, list_of_vegetobs, amount_to_eat):
         energy_to_eat = min(100 - self.energy, amount_to_eat)
         self.energy += energy_to_eat
-        list_of_vegetobs[self.row][
-            self.column
-        ].vegetob.density -= energy_to_eat
+        cell = list_of_vegetobs[self.row][self.column]
+        cell.vegetob.density -= energy_to_eat
+        cell.erbast.energy_changed(self)
 
 
 class Carviz(Creatures):
-    def __init__(self, lifetime=10):
+    __slots__ = (
+        "previous_position",
+        "energy",
+        "lifetime",
+        "age",
+        "soc_attitude",
+        "previously_visited",
+        "has_moved",
+    )
+
+    def __init__(self, lifetime=10, energy=None):
         super().__init__()
         self.previous_position = None
-        self._energy = np.random.randint(35, 95)
+        self.energy = np.random.randint(35, 95) if energy is None else energy
         self.lifetime = lifetime
-        self._age = 0
+        self.age = 0
         self.soc_attitude = 1
         self.previously_visited = None
         self.has_moved = False
 
-    @property
-    def energy(self):
-        return self._energy
-
-    @energy.setter
-    def energy(self, new_energy):
-        self._energy = new_energy
-
-    @property
-    def age(self):
-        return self._age
-
-    @age.setter
-    def age(self, new_age):
-        self._age = new_age
-
     def aging(self, list_of_creatures):
         self.age += 1
         if self.energy <= 1.0 or self.age >= self.lifetime:
@@ -223,38 +232,31 @@ class Carviz(Creatures):
             carv.row, carv.column = self.row, self.column
             list_of_creatures.append(carv)
 
-    def find_herd(self, list_of_herds):
-        self.kernel = self.get_adjacent_cells(self.row, self.column)
-        max_erbast = 0
-        max_erbast_cells = []
-        for kernel_row, kernel_col in self.kernel:
-            herd = list_of_herds[kernel_row][kernel_col]
-            if herd.terrain_type == "Ground":
-                len_of_erbast = herd.len_of_erbast()
-                if len_of_erbast > max_erbast:
-                    max_erbast = len_of_erbast
-                    max_erbast_cells = [(herd.row, herd.column)]
-                elif len_of_erbast == max_erbast:
-                    max_erbast_cells.append((herd.row, herd.column))
-        return (
-            np.array(random.choice(max_erbast_cells))
-            if max_erbast_cells
-            else np.array([self.row, self.column])
-        )
-
-    def find_pride(self, list_of_prides):
-        self.kernel = self.get_adjacent_cells(self.row, self.column)
-        pride = list_of_prides[self.row][self.column]
-        amount_of_pride = pride.len_of_carviz()
+    def _largest_pride_cell(self, kernel, list_of_prides, field):
+        if field is None:
+            pride = list_of_prides[self.row][self.column]
+            amount_of_pride = pride.len_of_carviz()
+        else:
+            amount_of_pride = int(field[self.row, self.column])
         row, column = self.row, self.column
-        for kernel_row, kernel_col in self.kernel:
-            pride_cell = list_of_prides[kernel_row][kernel_col]
-            if pride_cell.terrain_type == "Ground":
-                len_of_carviz = pride_cell.len_of_carviz()
-                if amount_of_pride < len_of_carviz:
-                    amount_of_pride = len_of_carviz
-                    row, column = pride_cell.row, pride_cell.column
-        return np.array([row, column])
+        for kernel_row, kernel_col in kernel.tolist():
+            if field is None:
+                len_of_carviz = list_of_prides[kernel_row][
+                    kernel_col
+                ].len_of_carviz()
+            else:
+                len_of_carviz = int(field[kernel_row, kernel_col])
+            if amount_of_pride < len_of_carviz:
+                amount_of_pride = len_of_carviz
+                row, column = kernel_row, kernel_col
+        return row, column
+
+    def find_pride(self, list_of_prides, cache):
+        return np.array(
+            self._neighborhood_query(
+                "prides", self._largest_pride_cell, list_of_prides, cache
+            )
+        )
 
     def move(self, list_of_vegetobs, coordinates):
         old_row, old_col = self.row, self.column
@@ -266,31 +268,32 @@ class Carviz(Creatures):
 
     def hunt(self, list_of_vegetobs):
         erbast = list_of_vegetobs[self.row][self.column].erbast
-        erb_swap = max(erbast, key=lambda erb: erb.energy, default=None)
+        erb_swap = erbast.strongest()
         if erb_swap is not None:
             energy_to_eat = min(100 - self.energy, erb_swap.energy)
             self.energy += energy_to_eat
             erbast.remove(erb_swap)
 
-    def decide_movement(self, list_of_prides, is_soc_attitude_high):
+    def decide_movement(self, list_of_prides, is_soc_attitude_high, cache):
         movement_coordinates = np.array([self.row, self.column])
         if list_of_prides[self.row][self.column].len_of_erbast() > 0:
             if is_soc_attitude_high and self.energy >= 40:
-                movement_coordinates = self.find_pride(list_of_prides)
+                movement_coordinates = self.find_pride(list_of_prides, cache)
             elif not is_soc_attitude_high and self.energy >= 40:
-                movement_coordinates = self.find_herd(list_of_prides)
+                movement_coordinates = self.find_herd(list_of_prides, cache)
         else:
             if is_soc_attitude_high:
-                movement_coordinates = self.find_pride(list_of_prides)
+                movement_coordinates = self.find_pride(list_of_prides, cache)
             else:
-                movement_coordinates = self.find_herd(list_of_prides)
+                movement_coordinates = self.find_herd(list_of_prides, cache)
 
+        # Without a find_* call above, this is the kernel examined on an
+        # earlier day.
+        kernel = self.examined_neighbors(cache.table)
         if (
             np.array_equal(movement_coordinates, [self.row, self.column])
-            and self.kernel.size > 0
+            and kernel.size > 0
         ):
-            movement_coordinates = self.kernel[
-                np.random.choice(self.kernel.shape[0])
-            ]
+            movement_coordinates = kernel[np.random.choice(kernel.shape[0])]
 
         return movement_coordinates
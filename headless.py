@@ -0,0 +1,149 @@
+import argparse
+import time
+
+from checkpoint import save_checkpoint, load_checkpoint
+from constants import (
+    MAX_DAYS,
+    GRID_SIZE,
+    MAX_LIFE_E,
+    MAX_LIFE_C,
+    NEIGHBORHOOD_E,
+    NEIGHBORHOOD_C,
+    SEEDING_DISTRIBUTIONS,
+)
+from instrumentation import TickRecorder
+from simulation_data_manager import SimulationParameters
+from simulation_engine import SimulationEngine
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the ecosystem simulation without the GUI."
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        help="last simulated day (default {})".format(MAX_DAYS),
+    )
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    parser.add_argument("--carviz", type=int, default=10)
+    parser.add_argument("--erbast", type=int, default=20)
+    parser.add_argument("--carviz-lifespan", type=int, default=MAX_LIFE_C)
+    parser.add_argument("--erbast-lifespan", type=int, default=MAX_LIFE_E)
+    parser.add_argument("--water", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--erbast-radius",
+        type=int,
+        default=NEIGHBORHOOD_E,
+        help="how far herds perceive food and other herds",
+    )
+    parser.add_argument(
+        "--carviz-radius",
+        type=int,
+        default=NEIGHBORHOOD_C,
+        help="how far prides perceive herds and other prides",
+    )
+    parser.add_argument(
+        "--distribution",
+        choices=SEEDING_DISTRIBUTIONS,
+        default="uniform",
+        help="how the initial creatures are spread over the ground",
+    )
+    parser.add_argument(
+        "--double-buffered",
+        action="store_true",
+        help="decide every move against the previous day's grid",
+    )
+    parser.add_argument(
+        "--tiles",
+        type=int,
+        nargs=2,
+        metavar=("ROWS", "COLUMNS"),
+        default=None,
+        help="split the world into tiles simulated in worker processes",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="append the results to the simulation data file",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        default=None,
+        help="write the final simulation state to PATH (.npz)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="PATH",
+        default=None,
+        help="continue from a checkpoint instead of a new world",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        help="write per-phase timings and counters per day (.csv/.jsonl)",
+    )
+    return parser.parse_args(argv)
+
+
+def run_headless(argv=None):
+    args = parse_arguments(argv)
+    if args.resume:
+        engine = load_checkpoint(args.resume, tiles=args.tiles)
+        if args.days is not None:
+            engine.max_days = args.days
+    else:
+        params = SimulationParameters(
+            animation_speed=0,
+            grid_size=args.grid_size,
+            initial_carviz_count=args.carviz,
+            initial_erbast_count=args.erbast,
+            carviz_lifespan=args.carviz_lifespan,
+            erbast_lifespan=args.erbast_lifespan,
+            water_coverage=args.water,
+        )
+        engine = SimulationEngine(
+            params,
+            max_days=MAX_DAYS if args.days is None else args.days,
+            seed=args.seed,
+            tiles=args.tiles,
+            erbast_radius=args.erbast_radius,
+            carviz_radius=args.carviz_radius,
+            distribution=args.distribution,
+            double_buffered=args.double_buffered,
+        )
+        engine.initialize()
+    recorder = TickRecorder(args.profile) if args.profile else None
+    engine.instrument(recorder)
+    first_day = engine.current_day
+
+    start = time.perf_counter()
+    try:
+        reason = engine.run()
+        if args.checkpoint:
+            save_checkpoint(engine, args.checkpoint)
+    finally:
+        engine.close()
+        if recorder is not None:
+            recorder.close()
+    elapsed = time.perf_counter() - start
+
+    engine.finish(reason, save=args.save)
+    ticks = engine.current_day - first_day
+    ticks_per_second = ticks / elapsed if elapsed else 0.0
+    print(
+        "Simulated {} days in {:.2f}s ({:.1f} ticks/s)".format(
+            ticks, elapsed, ticks_per_second
+        )
+    )
+    if recorder is not None:
+        print("Time per phase:\n" + recorder.summary())
+    return engine
+
+
+if __name__ == "__main__":
+    run_headless()
@@ -1,29 +1,102 @@
+import heapq
+import itertools
+
 import numpy as np
 
+from creature_group import CreatureGroup
+
+_entry_order = itertools.count()
 
-class Herd(list):
+
+class Herd(CreatureGroup):
     """
-    Herd class inherits from Python's list to store Erbast entities in the same cell.
+    Herd class stores the Erbast entities in the same cell.
     """
 
-    def __init__(self, row, column):
-        super().__init__()
-        self.row = row
-        self.column = column
+    # Lazy max-heap of (-energy, stamp, order, erbast) entries, built the
+    # first time the herd is hunted. The arrival stamp breaks energy ties
+    # in favour of the member nearest the front, as max() over the herd
+    # would; `order` only keeps entries comparable. Entries whose energy
+    # or stamp no longer matches are dropped when they reach the top.
+    __slots__ = ("_by_energy",)
 
-    def herd_decision(self, cells_list):
-        population = cells_list[self.row][self.column].len_of_erbast()
+    def __init__(self, row, column, tracker=None):
+        super().__init__(row, column, tracker)
+        self._by_energy = None
+
+    def _population_changed(self, delta):
+        self.tracker.erbast_changed(self.row, self.column, delta)
+
+    def append(self, erb):
+        super().append(erb)
+        if self._by_energy is not None:
+            self.energy_changed(erb)
+
+    def extend(self, erbasts):
+        erbasts = list(erbasts)
+        super().extend(erbasts)
+        if self._by_energy is not None:
+            for erb in erbasts:
+                self.energy_changed(erb)
+
+    def clear(self):
+        super().clear()
+        self._by_energy = None
+
+    def energy_changed(self, erb):
+        """Called after a member's energy changes (graze, move, aging)."""
+        if self._by_energy is None or id(erb) not in (self._positions or ()):
+            return
+        heapq.heappush(self._by_energy, self._energy_entry(erb))
+        if len(self._by_energy) > 2 * len(self) + 16:
+            self._build_energy_index()
+
+    def _energy_entry(self, erb):
+        return (
+            -erb.energy,
+            self._positions[id(erb)],
+            next(_entry_order),
+            erb,
+        )
+
+    def _build_energy_index(self):
+        self._by_energy = [self._energy_entry(erb) for erb in self]
+        heapq.heapify(self._by_energy)
+
+    def strongest(self):
+        """Member with the highest energy, or None for an empty herd."""
+        if not self:
+            return None
+        if self._by_energy is None:
+            self._build_energy_index()
+        heap, positions = self._by_energy, self._positions
+        while heap:
+            energy, stamp, _, erb = heap[0]
+            if positions.get(id(erb)) == stamp and -energy == erb.energy:
+                return erb
+            heapq.heappop(heap)
+        return None
+
+    def herd_decision(self, cells_list, cache):
         herd_coords = np.array([self.row, self.column])
+        for erbast, movement_coords in self.decisions(cells_list, cache):
+            self._handle_erbast_movement(
+                erbast, movement_coords, herd_coords, cells_list
+            )
 
+    def decisions(self, cells_list, cache):
+        """
+        Yields (erbast, movement coordinates) for every member, looking up
+        neighborhoods through the NeighborhoodCache `cache`. Each one
+        decides when it is reached, so moves made in between are seen.
+        """
+        population = cells_list[self.row][self.column].len_of_erbast()
         for erbast in self:
             social_attitude = self._calculate_social_attitude(
                 population, erbast.energy
             )
-            movement_coords = erbast.decide_movement(
-                cells_list, social_attitude >= 50
-            )
-            self._handle_erbast_movement(
-                erbast, movement_coords, herd_coords, cells_list
+            yield erbast, erbast.decide_movement(
+                cells_list, social_attitude >= 50, cache
             )
 
     @staticmethod
@@ -56,6 +129,73 @@ class Herd(list):
             list_of_cells,
         )
 
+    @staticmethod
+    def graze_herds(herds, density):
+        """
+        herd_graze for many herds at once, reading and writing vegetob
+        densities in the `density` array. Every herd picks the same
+        grazers with the same share of food as herd_graze; the densities
+        are then reduced one grazer rank at a time across all herds, with
+        the same truncation towards zero the VegetobView setter applies
+        after each bite.
+        """
+        members = [erb for herd in herds for erb in herd]
+        if not members:
+            return
+        populations = np.array([len(herd) for herd in herds])
+        herd_of = np.repeat(np.arange(len(herds)), populations)
+        starts = np.cumsum(populations) - populations
+        position = np.arange(len(members)) - starts[herd_of]
+        energy = np.array([erb.energy for erb in members], dtype=float)
+        starving = (energy <= 40) & ~np.array(
+            [erb.has_moved for erb in members], dtype=bool
+        )
+
+        rows = np.array([herd.row for herd in herds])
+        columns = np.array([herd.column for herd in herds])
+        food = density[rows, columns].astype(np.int64)
+        starving_count = np.bincount(
+            herd_of, weights=starving, minlength=len(herds)
+        ).astype(np.int64)
+        share = food / np.where(
+            starving_count > 0, starving_count, populations
+        )
+
+        # Only the starving graze if there is more food than starving
+        # erbasts, the first `food` members if there is less, and everyone
+        # on a tie.
+        starving_count, food_here = starving_count[herd_of], food[herd_of]
+        grazing = np.select(
+            [starving_count < food_here, starving_count > food_here],
+            [starving, position < food_here],
+            True,
+        )
+        eaters = np.flatnonzero(grazing)
+        if not len(eaters):
+            return
+        eater_herd = herd_of[eaters]
+        eaten = np.minimum(100 - energy[eaters], share[eater_herd])
+        energy[eaters] += eaten
+
+        # The k-th grazer of every herd bites in round k.
+        bite = np.cumsum(grazing)[eaters] - 1
+        bite -= (np.cumsum(grazing) - grazing)[starts][eater_herd]
+        food = food.astype(float)
+        order = np.argsort(bite, kind="stable")
+        rounds = np.searchsorted(bite[order], np.arange(bite.max() + 2))
+        for begin, end in zip(rounds[:-1], rounds[1:]):
+            bites = order[begin:end]
+            biting = eater_herd[bites]
+            food[biting] = np.trunc(food[biting] - eaten[bites])
+        density[rows, columns] = food
+
+        for index, herd, value in zip(
+            eaters.tolist(), eater_herd.tolist(), energy[eaters].tolist()
+        ):
+            erb = members[index]
+            erb.energy = value
+            herds[herd].energy_changed(erb)
+
     def _get_starving_erbasts(self):
         return [
             erb_idx
@@ -0,0 +1,74 @@
+import csv
+import json
+from dataclasses import dataclass, asdict, fields
+
+PHASES = ("grow", "death", "decisions", "fights", "actions", "aging")
+
+
+@dataclass
+class TickRecord:
+    """Wall time per phase and event counters for one simulated day."""
+
+    day: int = 0
+    grow_time: float = 0.0
+    death_time: float = 0.0
+    decisions_time: float = 0.0
+    fights_time: float = 0.0
+    actions_time: float = 0.0
+    aging_time: float = 0.0
+    total_time: float = 0.0
+    cells_visited: int = 0
+    creatures_processed: int = 0
+    moves: int = 0
+    hunts: int = 0
+    births: int = 0
+    deaths: int = 0
+
+
+class TickRecorder:
+    """
+    Receives a TickRecord per day from an instrumented SimulationEngine,
+    keeps the latest one and running per-phase totals, and optionally
+    streams every record to a .csv or .jsonl file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.latest = None
+        self.ticks = 0
+        self.phase_totals = dict.fromkeys(PHASES, 0.0)
+        self._file = None
+        self._writer = None
+        if path is not None:
+            self._file = open(path, "w", newline="")
+            if path.endswith(".csv"):
+                self._writer = csv.DictWriter(
+                    self._file,
+                    fieldnames=[field.name for field in fields(TickRecord)],
+                )
+                self._writer.writeheader()
+
+    def record(self, record):
+        self.latest = record
+        self.ticks += 1
+        for phase in PHASES:
+            self.phase_totals[phase] += getattr(record, f"{phase}_time")
+        if self._writer is not None:
+            self._writer.writerow(asdict(record))
+        elif self._file is not None:
+            self._file.write(json.dumps(asdict(record)) + "\n")
+
+    def summary(self):
+        total = sum(self.phase_totals.values()) or 1.0
+        return "\n".join(
+            "  {:<10} {:8.3f}s {:5.1f}%".format(
+                phase, seconds, 100 * seconds / total
+            )
+            for phase, seconds in self.phase_totals.items()
+        )
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
@@ -0,0 +1,183 @@
+import numpy as np
+
+from constants import GROUND
+
+# Same scan order as the original nested loops over (row - 1 .. row + 1,
+# col - 1 .. col + 1), so ties are broken identically.
+OFFSETS = (
+    (-1, -1),
+    (-1, 0),
+    (-1, 1),
+    (0, -1),
+    (0, 1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+)
+
+
+class NeighborTable:
+    """
+    Ground-only 8-neighborhood of every cell, built once per grid in
+    fixed-width form: `coords[row, col, :counts[row, col]]` holds the
+    (row, col) pairs of the in-bounds, non-water neighbors.
+    """
+
+    def __init__(self, terrain):
+        rows, columns = terrain.shape
+        ground = terrain == GROUND
+        self.shape = (rows, columns)
+        self.coords = np.full(
+            (rows, columns, len(OFFSETS), 2), -1, dtype=np.int32
+        )
+        self.counts = np.zeros((rows, columns), dtype=np.uint8)
+
+        row_idx, col_idx = np.indices((rows, columns))
+        for d_row, d_col in OFFSETS:
+            n_row, n_col = row_idx + d_row, col_idx + d_col
+            valid = (
+                (n_row >= 0)
+                & (n_row < rows)
+                & (n_col >= 0)
+                & (n_col < columns)
+            )
+            valid[valid] = ground[n_row[valid], n_col[valid]]
+            src_row, src_col = row_idx[valid], col_idx[valid]
+            slot = self.counts[src_row, src_col]
+            self.coords[src_row, src_col, slot, 0] = n_row[valid]
+            self.coords[src_row, src_col, slot, 1] = n_col[valid]
+            self.counts[src_row, src_col] += 1
+
+    def neighbors(self, row, column):
+        """Returns a (k, 2) view of the ground neighbors of (row, column)."""
+        return self.coords[row, column, : self.counts[row, column]]
+
+    def count(self, row, column):
+        return int(self.counts[row, column])
+
+
+class NeighborhoodCache:
+    """
+    Per-cell results of the find_* neighborhood queries ("food", "herds",
+    "prides"), shared by all creatures of a cell during one decisions
+    phase. `table` is the NeighborTable of the world being simulated and
+    `radii` maps each creature class to its perception radius. Without
+    `memoize` (no tracker reports population changes), every query is
+    computed afresh.
+
+    With radius 1 a query compares the 8 neighbors' own contents. With a
+    radius R > 1 each neighbor is scored by an aggregate over the window
+    of radius R - 1 around it (together they cover the window of radius R
+    around the creature): maximum density for food, summed populations
+    for herds and prides. Those fields are built once per phase from the
+    populations at its start, so they cost the same per creature for any
+    radius.
+
+    Densities do not change while creatures decide, so food results stay
+    valid for the whole phase. Radius-1 herd and pride results are dropped
+    for the 3x3 block around every cell whose population changes.
+    """
+
+    def __init__(self, table, radii, memoize=True):
+        self.table = table
+        columns = self.columns = table.shape[1]
+        self.radii = radii
+        self.memoize = memoize
+        self.fields = {}
+        self._memos = {}
+        # Flat offsets of the 3x3 block; near the left and right edges they
+        # wrap into the adjacent row, which only drops a few extra entries.
+        self._block = tuple(
+            d_row * columns + d_col
+            for d_row in (-1, 0, 1)
+            for d_col in (-1, 0, 1)
+        )
+
+    def memo(self, query, radius):
+        memo = self._memos.get((query, radius))
+        if memo is None:
+            memo = self._memos[(query, radius)] = {}
+        return memo
+
+    def build_fields(self, density, erbast_population, carviz_population):
+        """Window aggregates for every (query, radius) with radius > 1."""
+        sources = {
+            "food": (density, window_max),
+            "herds": (erbast_population, window_sum),
+            "prides": (carviz_population, window_sum),
+        }
+        for radius in set(self.radii.values()):
+            if radius > 1:
+                for query, (values, aggregate) in sources.items():
+                    self.fields[(query, radius)] = aggregate(
+                        values, radius - 1
+                    )
+
+    def erbast_changed(self, row, column):
+        self._invalidate(self._memos.get(("herds", 1)), row, column)
+
+    def carviz_changed(self, row, column):
+        self._invalidate(self._memos.get(("prides", 1)), row, column)
+
+    def _invalidate(self, memo, row, column):
+        if memo:
+            index = row * self.columns + column
+            for offset in self._block:
+                memo.pop(index + offset, None)
+
+
+def window_sum(values, radius):
+    """
+    Sum over the (2 * radius + 1)^2 window around every cell, clipped at
+    the grid edges, from one summed-area table.
+    """
+    rows, columns = values.shape
+    table = np.zeros((rows + 1, columns + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(values, axis=0), axis=1, out=table[1:, 1:])
+    top = np.clip(np.arange(rows) - radius, 0, rows)
+    bottom = np.clip(np.arange(rows) + radius + 1, 0, rows)
+    left = np.clip(np.arange(columns) - radius, 0, columns)
+    right = np.clip(np.arange(columns) + radius + 1, 0, columns)
+    return (
+        table[np.ix_(bottom, right)]
+        - table[np.ix_(top, right)]
+        - table[np.ix_(bottom, left)]
+        + table[np.ix_(top, left)]
+    )
+
+
+def _running_max(values, radius):
+    """Maximum over rows i - radius .. i + radius, by span doubling."""
+    rows = values.shape[0]
+    width = 2 * radius + 1
+    fill = np.full((radius,) + values.shape[1:], values.min(), values.dtype)
+    result = np.concatenate([fill, values, fill])
+    span = 1
+    while 2 * span <= width:
+        result = np.maximum(result[:-span], result[span:])
+        span *= 2
+    return np.maximum(
+        result[:rows], result[width - span: width - span + rows]
+    )
+
+
+def window_max(values, radius):
+    """
+    Maximum over the (2 * radius + 1)^2 window around every cell, clipped
+    at the grid edges, in O(log radius) array passes per axis.
+    """
+    if radius == 0:
+        return values.copy()
+    return _running_max(_running_max(values, radius).T, radius).T
+
+
+def count_neighbors(mask):
+    """Number of True cells in the 8-neighborhood of every cell of `mask`."""
+    padded = np.pad(mask.astype(np.uint8), 1)
+    rows, columns = mask.shape
+    counts = np.zeros((rows, columns), dtype=np.uint8)
+    for d_row, d_col in OFFSETS:
+        counts += padded[
+            1 + d_row: 1 + d_row + rows, 1 + d_col: 1 + d_col + columns
+        ]
+    return counts
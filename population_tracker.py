@@ -0,0 +1,134 @@
+import heapq
+
+import numpy as np
+
+from constants import WATER
+
+WATER_COLOR = 5
+GROUND_COLOR = 15
+ERBAST_COLOR = 25
+CARVIZ_COLOR = 35
+SHARED_COLOR = 45
+
+
+class PopulationTracker:
+    """
+    Per-cell populations, occupied-cell counts and colour classes, updated
+    by the cell Herd/Pride containers whenever a creature enters or leaves
+    a cell, so statistics never need a full-grid rescan. The set of
+    occupied cells doubles as the index the controller phases iterate.
+    """
+
+    def __init__(self, terrain):
+        shape = terrain.shape
+        self.columns = shape[1]
+        self.occupied = set()
+        self._scan = None
+        self._scan_position = -1
+        self.neighborhood_cache = None
+        self.erbast_population = np.zeros(shape, dtype=np.int32)
+        self.carviz_population = np.zeros(shape, dtype=np.int32)
+        self.erbast_cells = 0
+        self.carviz_cells = 0
+        self.shared_cells = 0
+        # Cumulative arrivals and departures, read by the instrumentation.
+        self.erbast_added = 0
+        self.erbast_removed = 0
+        self.carviz_added = 0
+        self.carviz_removed = 0
+        self.color_map = np.full(shape, float(GROUND_COLOR))
+        self.color_map[terrain == WATER] = WATER_COLOR
+
+    @property
+    def erbast_total(self):
+        return int(self.erbast_population.sum())
+
+    @property
+    def carviz_total(self):
+        return int(self.carviz_population.sum())
+
+    def erbast_changed(self, row, column, delta):
+        if self.neighborhood_cache is not None:
+            self.neighborhood_cache.erbast_changed(row, column)
+        if delta > 0:
+            self.erbast_added += delta
+        else:
+            self.erbast_removed -= delta
+        before = self.erbast_population[row, column]
+        after = before + delta
+        self.erbast_population[row, column] = after
+        if (before == 0) != (after == 0):
+            self.erbast_cells += 1 if after else -1
+            if self.carviz_population[row, column]:
+                self.shared_cells += 1 if after else -1
+            else:
+                self._occupancy_changed(row, column, after != 0)
+            self._recolor(row, column)
+
+    def carviz_changed(self, row, column, delta):
+        if self.neighborhood_cache is not None:
+            self.neighborhood_cache.carviz_changed(row, column)
+        if delta > 0:
+            self.carviz_added += delta
+        else:
+            self.carviz_removed -= delta
+        before = self.carviz_population[row, column]
+        after = before + delta
+        self.carviz_population[row, column] = after
+        if (before == 0) != (after == 0):
+            self.carviz_cells += 1 if after else -1
+            if self.erbast_population[row, column]:
+                self.shared_cells += 1 if after else -1
+            else:
+                self._occupancy_changed(row, column, after != 0)
+            self._recolor(row, column)
+
+    def _occupancy_changed(self, row, column, occupied):
+        index = row * self.columns + column
+        if not occupied:
+            self.occupied.discard(index)
+            return
+        self.occupied.add(index)
+        if self._scan is not None and index > self._scan_position:
+            heapq.heappush(self._scan, index)
+
+    def occupied_cells(self):
+        """
+        Yields occupied (row, column) pairs in row-major order. Cells that
+        become occupied ahead of the scan while it runs are yielded too,
+        exactly as a full-grid loop would reach them; cells emptied before
+        the scan gets there may still be yielded.
+        """
+        heap = list(self.occupied)
+        heapq.heapify(heap)
+        self._scan, self._scan_position = heap, -1
+        try:
+            while heap:
+                index = heapq.heappop(heap)
+                if index <= self._scan_position:
+                    continue
+                self._scan_position = index
+                yield divmod(index, self.columns)
+        finally:
+            self._scan = None
+
+    def event_counts(self):
+        return (
+            self.erbast_added,
+            self.erbast_removed,
+            self.carviz_added,
+            self.carviz_removed,
+        )
+
+    def _recolor(self, row, column):
+        has_erbast = self.erbast_population[row, column] > 0
+        has_carviz = self.carviz_population[row, column] > 0
+        if has_erbast and has_carviz:
+            color = SHARED_COLOR
+        elif has_erbast:
+            color = ERBAST_COLOR
+        elif has_carviz:
+            color = CARVIZ_COLOR
+        else:
+            color = GROUND_COLOR
+        self.color_map[row, column] = color
@@ -3,14 +3,16 @@ import random
 import numpy as np
 from collections import defaultdict
 
+from creature_group import CreatureGroup
 
-class Pride(list):
-    """Pride class inherits from list to store Carviz entities in the same cell."""
 
-    def __init__(self, row, column):
-        super().__init__()
-        self.row = row
-        self.column = column
+class Pride(CreatureGroup):
+    """Pride class stores the Carviz entities in the same cell."""
+
+    __slots__ = ()
+
+    def _population_changed(self, delta):
+        self.tracker.carviz_changed(self.row, self.column, delta)
 
     def calculate_social_attitude(self, pride_obj, cells_list):
         return [
@@ -21,8 +23,12 @@ class Pride(list):
     @staticmethod
     def _calculate_individual_social_attitude(carviz, cells_list):
         population = cells_list[carviz.row][carviz.column].len_of_carviz()
+        return Pride._social_attitude(population, carviz.energy)
+
+    @staticmethod
+    def _social_attitude(population, energy):
         population_inverse = 1 if population == 100 else 100 - population
-        return population_inverse * carviz.energy / 100
+        return population_inverse * energy / 100
 
     def fight_between_prides(self, carviz_list, cells_list):
         prides = self._group_carviz_into_prides(carviz_list)
@@ -44,6 +50,95 @@ class Pride(list):
 
         return self._create_new_pride(remaining_prides)
 
+    @staticmethod
+    def resolve_fights(prides):
+        """
+        fight_between_prides for many cells in one pass. The carviz of
+        every pride in `prides` are grouped by (cell, previously visited
+        position) with group ids in order of first appearance; medians of
+        the social attitudes, the random winner and the join rule are then
+        evaluated as array operations over those ids. The python RNG is
+        drawn exactly as the per-cell calls would draw it.
+
+        Returns three arrays with one entry per contested cell (more than
+        one group): its index in `prides`, the winning group's position
+        among that cell's groups and whether the other groups joined.
+
+        The fights phase currently has no effect on a simulation: nothing
+        assigns `previously_visited`, so every cell holds a single group
+        and this returns after the gather, and the controller does not
+        apply the outcome to the grid anyway.
+        """
+        keys = {}
+        key_ids, energies = [], []
+        for pride in prides:
+            key_ids.extend(
+                keys.setdefault(carviz.previously_visited, len(keys))
+                for carviz in pride
+            )
+            energies.extend(carviz.energy for carviz in pride)
+        no_fights = (
+            np.empty(0, dtype=np.intp),
+            np.empty(0, dtype=np.intp),
+            np.empty(0, dtype=bool),
+        )
+        if len(keys) < 2:
+            return no_fights
+
+        populations = np.array([len(pride) for pride in prides])
+        cell_ids = np.repeat(np.arange(len(prides)), populations)
+        populations = populations[cell_ids]
+        attitudes = (
+            np.where(populations == 100, 1, 100 - populations)
+            * np.array(energies, dtype=float)
+            / 100
+        )
+        pairs, first, group_of = np.unique(
+            np.column_stack((cell_ids, key_ids)),
+            axis=0,
+            return_index=True,
+            return_inverse=True,
+        )
+        # Renumber groups by cell, then by first member, as the per-cell
+        # defaultdict would have created them.
+        order = np.lexsort((first, pairs[:, 0]))
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        group_of = rank[group_of.ravel()]
+        group_cells = pairs[order, 0]
+
+        cells, group_start, groups_per_cell = np.unique(
+            group_cells, return_index=True, return_counts=True
+        )
+        contested = groups_per_cell > 1
+        if not contested.any():
+            return no_fights
+
+        by_group = np.lexsort((attitudes, group_of))
+        sorted_attitudes = attitudes[by_group]
+        member_start = np.searchsorted(
+            group_of[by_group], np.arange(len(group_cells))
+        )
+        members = np.diff(np.append(member_start, len(by_group)))
+        medians = (
+            sorted_attitudes[member_start + (members - 1) // 2]
+            + sorted_attitudes[member_start + members // 2]
+        ) / 2
+
+        # random.choices(range(n)) draws floor(random() * n).
+        draws = np.array([random.random() for _ in range(contested.sum())])
+        winners = np.floor(draws * groups_per_cell[contested]).astype(
+            np.intp
+        )
+
+        # The losing groups join if each of their medians reaches 10.
+        group_ok = medians >= 10
+        group_ok[group_start[contested] + winners] = True
+        joined = np.logical_and.reduceat(group_ok, group_start) & (
+            groups_per_cell > 2
+        )
+        return cells[contested], winners, joined[contested]
+
     @staticmethod
     def _group_carviz_into_prides(carviz_list):
         prides_dict = defaultdict(lambda: Pride(0, 0))
@@ -88,18 +183,28 @@ class Pride(list):
         total_energy = sum(carv.energy for carv in self)
         return int(total_energy / len(self))
 
-    def pride_decision(self, cells_list):
+    def pride_decision(self, cells_list, cache):
+        for carv, movement_coords in self.decisions(cells_list, cache):
+            self._handle_carviz_movement(carv, movement_coords, cells_list)
+
+    def decisions(self, cells_list, cache):
+        """
+        Yields (carviz, movement coordinates) for every member, looking up
+        neighborhoods through the NeighborhoodCache `cache`. Each one
+        decides when it is reached, so moves made in between are seen.
+        """
+        # Members share this cell, so its population is looked up once per
+        # carviz without re-indexing the grid.
+        cell = cells_list[self.row][self.column]
         for carv in self:
-            self._handle_carviz_movement(carv, cells_list)
-
-    def _handle_carviz_movement(self, carv, cells_list):
-        social_attitude = self._calculate_individual_social_attitude(
-            carv, cells_list
-        )
-        movement_coords = carv.decide_movement(
-            cells_list, social_attitude >= 50
-        )
+            social_attitude = self._social_attitude(
+                cell.len_of_carviz(), carv.energy
+            )
+            yield carv, carv.decide_movement(
+                cells_list, social_attitude >= 50, cache
+            )
 
+    def _handle_carviz_movement(self, carv, movement_coords, cells_list):
         if np.array_equal(movement_coords, [self.row, self.column]):
             carv.has_moved = False
         else:
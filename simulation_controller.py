@@ -1,60 +1,307 @@
+import time
+
+import numpy as np
+
+from constants import GROUND, WATER, MAX_HERD, MAX_PRIDE
+from creatures import Erbast, Carviz
+from instrumentation import PHASES, TickRecord
+from neighbors import NeighborTable, NeighborhoodCache, count_neighbors
+from herd import Herd
+from pride import Pride
+
+
 class SimulationController:
-    """SimulationController class manages the simulation steps."""
+    """
+    SimulationController class manages the simulation steps.
+
+    With `double_buffered`, the decisions phase no longer moves creatures
+    while it scans the grid: every creature decides against the grid as
+    it was when the phase began, and the moves are applied afterwards.
+    The other phases only change the cell they visit, so they do not
+    depend on the scan order in either mode.
+    """
+
+    # Group attribute of a cell and its size limit, per species.
+    _GROUPS = {Erbast: ("erbast", MAX_HERD), Carviz: ("pride", MAX_PRIDE)}
+
+    def __init__(self, world=None, tracker=None, erbast_radius=1,
+                 carviz_radius=1, double_buffered=False):
+        if max(erbast_radius, carviz_radius) > 1 and (
+            world is None or tracker is None
+        ):
+            raise ValueError(
+                "Perception radii above 1 need a world and a tracker"
+            )
+        self.world = world
+        self.tracker = tracker
+        self.neighbors = (
+            None if world is None else NeighborTable(world.terrain)
+        )
+        self.radii = {Erbast: erbast_radius, Carviz: carviz_radius}
+        self.double_buffered = double_buffered
+        self.instrumented = False
+        self.last_record = None
 
     def simulate(self, cells_list):
+        if self.instrumented:
+            self.last_record = self._simulate_instrumented(cells_list)
+            return
+        self.simulate_movement(cells_list)
+        self.simulate_interactions(cells_list)
+
+    def simulate_movement(self, cells_list):
+        """Phases up to and including the movement decisions."""
         self._grow_vegetob(cells_list)
         self._handle_creature_death(cells_list)
         self._handle_creature_decisions(cells_list)
+
+    def simulate_interactions(self, cells_list):
+        """Phases that act on creatures where they ended up after moving."""
         self._handle_pride_fights(cells_list)
         self._handle_creature_actions(cells_list)
         self._handle_creature_aging(cells_list)
 
-    @staticmethod
-    def _grow_vegetob(cells_list):
-        for row in cells_list:
-            for cell in row:
-                if cell.terrain_type != "Water":
-                    cell.vegetob.grow()
+    def _simulate_instrumented(self, cells_list):
+        """
+        Same phases as simulate, timing each one and reading the tracker's
+        arrival/departure counters around it. Every phase returns the
+        number of cells it visited.
+        """
+        tracker = self.tracker
+        record = TickRecord(
+            creatures_processed=tracker.erbast_total + tracker.carviz_total
+        )
+        for phase in PHASES:
+            handler = getattr(self, self._PHASE_HANDLERS[phase])
+            erbast_in, erbast_out, carviz_in, carviz_out = (
+                tracker.event_counts()
+            )
+            start = time.perf_counter()
+            record.cells_visited += handler(cells_list)
+            setattr(record, f"{phase}_time", time.perf_counter() - start)
+            added = (
+                tracker.erbast_added - erbast_in
+                + tracker.carviz_added - carviz_in
+            )
+            removed = (
+                tracker.erbast_removed - erbast_out
+                + tracker.carviz_removed - carviz_out
+            )
+            if phase == "decisions":
+                # A move is one departure plus one arrival.
+                record.moves += added
+            elif phase == "actions":
+                record.hunts += tracker.erbast_removed - erbast_out
+            else:
+                record.births += added
+                record.deaths += removed
+        record.total_time = sum(
+            getattr(record, f"{phase}_time") for phase in PHASES
+        )
+        return record
 
-    @staticmethod
-    def _handle_creature_death(cells_list):
-        for row in cells_list:
-            for cell in row:
-                if cell.erbast or cell.pride:
-                    cell.death_from_vegetob(cells_list)
+    _PHASE_HANDLERS = {
+        "grow": "_grow_vegetob",
+        "death": "_handle_creature_death",
+        "decisions": "_handle_creature_decisions",
+        "fights": "_handle_pride_fights",
+        "actions": "_handle_creature_actions",
+        "aging": "_handle_creature_aging",
+    }
 
-    @staticmethod
-    def _handle_creature_decisions(cells_list):
-        for row in cells_list:
-            for cell in row:
-                if cell.erbast:
-                    cell.erbast.herd_decision(cells_list)
-                if cell.pride:
-                    cell.pride.pride_decision(cells_list)
+    def _occupied_cells(self, cells_list):
+        """
+        Cells that may hold creatures, in scan order. With a tracker only
+        its occupied-cell index is walked, so the creature phases cost
+        time proportional to the population instead of the world area.
+        """
+        if self.tracker is None:
+            for row in cells_list:
+                yield from row
+            return
+        for row, column in self.tracker.occupied_cells():
+            yield cells_list[row][column]
 
-    @staticmethod
-    def _handle_pride_fights(cells_list):
+    def _grow_vegetob(self, cells_list):
+        if self.world is not None:
+            # Ground cells hold VegetobViews over world.density, so one
+            # array update grows every cell at once.
+            density = self.world.density
+            np.add(
+                density,
+                1,
+                out=density,
+                where=(self.world.terrain != WATER) & (density < 100),
+            )
+            return 0
+        visited = 0
         for row in cells_list:
             for cell in row:
-                if cell.pride:
-                    cell.pride.fight_between_prides(cell.pride, cells_list)
+                visited += 1
+                if cell.terrain != WATER:
+                    cell.vegetob.grow()
+        return visited
 
-    @staticmethod
-    def _handle_creature_actions(cells_list):
-        for row in cells_list:
-            for cell in row:
+    def _handle_creature_death(self, cells_list):
+        candidates = np.argwhere(self._starvation_mask(cells_list))
+        for row, column in candidates:
+            cell = cells_list[row][column]
+            if cell.erbast or cell.pride:
+                cell.clear_creatures()
+        return len(candidates)
+
+    def _starvation_mask(self, cells_list):
+        """
+        Cells whose eight neighbors are all ground at full vegetob density.
+        Creatures on those cells are cleared in bulk.
+        """
+        if self.world is not None:
+            density, terrain = self.world.density, self.world.terrain
+        else:
+            terrain = np.array(
+                [[cell.terrain for cell in row] for row in cells_list]
+            )
+            density = np.array(
+                [
+                    [cell.vegetob.density if cell.vegetob else 0
+                     for cell in row]
+                    for row in cells_list
+                ]
+            )
+        full_density = (terrain == GROUND) & (density == 100)
+        return count_neighbors(full_density) == 8
+
+    def _handle_creature_decisions(self, cells_list):
+        if self.double_buffered:
+            return self._handle_buffered_decisions(cells_list)
+        cache = self._new_neighborhood_cache(cells_list)
+        self._set_neighborhood_cache(cache)
+        visited = 0
+        try:
+            for cell in self._occupied_cells(cells_list):
+                visited += 1
                 if cell.erbast:
-                    cell.erbast.herd_graze(cells_list)
+                    cell.erbast.herd_decision(cells_list, cache)
                 if cell.pride:
-                    for carviz in cell.pride:
-                        if cell.erbast:
-                            carviz.hunt(cells_list)
+                    cell.pride.pride_decision(cells_list, cache)
+        finally:
+            self._set_neighborhood_cache(None)
+        return visited
 
-    @staticmethod
-    def _handle_creature_aging(cells_list):
-        for row in cells_list:
-            for cell in row:
+    def _handle_buffered_decisions(self, cells_list):
+        """
+        Collects every creature's intended move without changing the grid,
+        then applies the moves in scan order (herd before pride, members in
+        group order). A move into a herd of MAX_HERD or a pride of
+        MAX_PRIDE is refused and the creature stays. Each creature decides
+        exactly once, however far it moves.
+        """
+        cache = self._new_neighborhood_cache(cells_list)
+        self._set_neighborhood_cache(cache)
+        intents = []
+        visited = 0
+        try:
+            for cell in self._occupied_cells(cells_list):
+                visited += 1
                 if cell.erbast:
-                    cell.erbast.group_aging()
+                    intents.extend(cell.erbast.decisions(cells_list, cache))
                 if cell.pride:
-                    cell.pride.group_aging()
+                    intents.extend(cell.pride.decisions(cells_list, cache))
+        finally:
+            self._set_neighborhood_cache(None)
+        self._apply_moves(intents, cells_list)
+        return visited
+
+    def _apply_moves(self, intents, cells_list):
+        for creature, (row, column) in intents:
+            attribute, limit = self._GROUPS[type(creature)]
+            if (row, column) == (creature.row, creature.column) or len(
+                getattr(cells_list[row][column], attribute)
+            ) >= limit:
+                creature.has_moved = False
+            else:
+                creature.move(cells_list, (row, column))
+
+    def _neighbor_table(self, cells_list):
+        """The NeighborTable of this controller's world, built once."""
+        if self.neighbors is None:
+            self.neighbors = NeighborTable(
+                np.array(
+                    [[cell.terrain for cell in row] for row in cells_list]
+                )
+            )
+        return self.neighbors
+
+    def _new_neighborhood_cache(self, cells_list):
+        # Without a tracker nothing reports moves, so nothing is memoized.
+        cache = NeighborhoodCache(
+            self._neighbor_table(cells_list),
+            self.radii,
+            memoize=self.tracker is not None,
+        )
+        if max(self.radii.values()) > 1:
+            cache.build_fields(
+                self.world.density,
+                self.tracker.erbast_population,
+                self.tracker.carviz_population,
+            )
+        return cache
+
+    def _set_neighborhood_cache(self, cache):
+        """The tracker keeps the cache current as creatures move."""
+        if self.tracker is not None:
+            self.tracker.neighborhood_cache = cache
+
+    def _handle_pride_fights(self, cells_list):
+        # As with the per-cell fight_between_prides calls this replaces,
+        # the outcome is not applied to the grid, so the phase has no
+        # effect on the simulation.
+        visited = 0
+        prides = []
+        for cell in self._occupied_cells(cells_list):
+            visited += 1
+            if cell.pride:
+                prides.append(cell.pride)
+        Pride.resolve_fights(prides)
+        return visited
+
+    def _handle_creature_actions(self, cells_list):
+        if self.world is not None:
+            return self._handle_batched_actions(cells_list)
+        visited = 0
+        for cell in self._occupied_cells(cells_list):
+            visited += 1
+            if cell.erbast:
+                cell.erbast.herd_graze(cells_list)
+            if cell.pride:
+                for carviz in cell.pride:
+                    if cell.erbast:
+                        carviz.hunt(cells_list)
+        return visited
+
+    def _handle_batched_actions(self, cells_list):
+        """
+        Grazes every herd in one Herd.graze_herds call, then lets the
+        carviz hunt. Grazing and hunting only touch their own cell, so
+        this gives the same result as doing both cell by cell.
+        """
+        cells = list(self._occupied_cells(cells_list))
+        Herd.graze_herds(
+            [cell.erbast for cell in cells if cell.erbast], self.world.density
+        )
+        for cell in cells:
+            if cell.pride:
+                for carviz in cell.pride:
+                    if cell.erbast:
+                        carviz.hunt(cells_list)
+        return len(cells)
+
+    def _handle_creature_aging(self, cells_list):
+        visited = 0
+        for cell in self._occupied_cells(cells_list):
+            visited += 1
+            if cell.erbast:
+                cell.erbast.group_aging()
+            if cell.pride:
+                cell.pride.group_aging()
+        return visited
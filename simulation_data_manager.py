@@ -1,6 +1,8 @@
 import json
-from dataclasses import dataclass, asdict
-from typing import Dict, Any
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, asdict, fields
+from typing import Dict, Any, Iterator, Tuple
 import os
 import numpy as np
 
@@ -36,50 +38,204 @@ class NumpyEncoder(json.JSONEncoder):
         return super(NumpyEncoder, self).default(obj)
 
 
+PARAMETER_COLUMNS = [field.name for field in fields(SimulationParameters)]
+RESULT_COLUMNS = [field.name for field in fields(SimulationResults)]
+WORLD_COLUMNS = [
+    name for name in PARAMETER_COLUMNS if name != "animation_speed"
+]
+SCHEMA_VERSION = 1
+
+
+class ResultsStore:
+    """
+    Append-only SQLite store of finished runs, one row per run. Appends
+    are single-row transactions, so concurrent processes never lose each
+    other's results, and lookups by parameters go through an index.
+    """
+
+    def __init__(self, path: str, legacy_file: str = None):
+        self.path = path
+        self.legacy_file = legacy_file
+        with closing(self._connect()) as connection:
+            self._migrate(connection)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _migrate(self, connection: sqlite3.Connection):
+        if connection.execute("PRAGMA user_version").fetchone()[0]:
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have created the schema while we waited.
+            if not connection.execute("PRAGMA user_version").fetchone()[0]:
+                self._create_schema(connection)
+                if self.legacy_file and os.path.exists(self.legacy_file):
+                    self._import_legacy(connection)
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection):
+        columns = ", ".join(
+            [f"{name} INTEGER NOT NULL" for name in PARAMETER_COLUMNS]
+            + [
+                "simulation_completed INTEGER NOT NULL",
+                "duration TEXT NOT NULL",
+                "max_carviz_population INTEGER NOT NULL",
+                "max_erbast_population INTEGER NOT NULL",
+                "total_hunts INTEGER NOT NULL",
+            ]
+        )
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS runs "
+            f"(id INTEGER PRIMARY KEY, {columns})"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS runs_parameters ON runs "
+            f"({', '.join(WORLD_COLUMNS)})"
+        )
+
+    def _import_legacy(self, connection: sqlite3.Connection):
+        try:
+            with open(self.legacy_file, "r") as file:
+                records = json.load(file)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(records, list):
+            return
+        connection.executemany(
+            self._insert_statement(), self._legacy_rows(records)
+        )
+
+    @classmethod
+    def _legacy_rows(cls, records):
+        """Rows for the well-formed legacy records; others are skipped."""
+        for record in records:
+            try:
+                params = SimulationParameters(**record["Parameters"])
+                results = SimulationResults(**record["Results"])
+            except (KeyError, TypeError):
+                continue
+            row = cls._row(params, results)
+            # NULLs or nested values would abort the whole migration.
+            if all(isinstance(value, (int, float, str)) for value in row):
+                yield row
+
+    @staticmethod
+    def _insert_statement() -> str:
+        names = PARAMETER_COLUMNS + RESULT_COLUMNS
+        return (
+            f"INSERT INTO runs ({', '.join(names)}) "
+            f"VALUES ({', '.join('?' * len(names))})"
+        )
+
+    @staticmethod
+    def _row(
+        params: SimulationParameters, results: SimulationResults
+    ) -> tuple:
+        values = list(asdict(params).values()) + list(asdict(results).values())
+        return tuple(
+            value.item() if isinstance(value, np.generic) else value
+            for value in values
+        )
+
+    def append(self, params: SimulationParameters, results: SimulationResults):
+        with closing(self._connect()) as connection:
+            connection.execute(
+                self._insert_statement(), self._row(params, results)
+            )
+
+    @staticmethod
+    def _where(filters: Dict[str, Any]) -> str:
+        for name in filters:
+            if name not in PARAMETER_COLUMNS:
+                raise ValueError(f"Unknown simulation parameter: {name}")
+        if not filters:
+            return ""
+        return " WHERE " + " AND ".join(f"{name} = ?" for name in filters)
+
+    def iter_runs(
+        self, last: int = None, **filters
+    ) -> Iterator[Tuple[SimulationParameters, SimulationResults]]:
+        """
+        Streams stored runs in insertion order, filtered by parameters. With
+        `last`, only the most recent `last` matching runs are streamed.
+        """
+        columns = ", ".join(PARAMETER_COLUMNS + RESULT_COLUMNS)
+        query = f"SELECT id, {columns} FROM runs{self._where(filters)}"
+        arguments = tuple(filters.values())
+        if last is not None:
+            query = f"SELECT * FROM ({query} ORDER BY id DESC LIMIT ?)"
+            arguments += (last,)
+        query += " ORDER BY id"
+        split = len(PARAMETER_COLUMNS) + 1
+        with closing(self._connect()) as connection:
+            for row in connection.execute(query, arguments):
+                params = SimulationParameters(*row[1:split])
+                values = dict(zip(RESULT_COLUMNS, row[split:]))
+                values["simulation_completed"] = bool(
+                    values["simulation_completed"]
+                )
+                yield params, SimulationResults(**values)
+
+    def count(self, **filters) -> int:
+        query = f"SELECT COUNT(*) FROM runs{self._where(filters)}"
+        with closing(self._connect()) as connection:
+            cursor = connection.execute(query, tuple(filters.values()))
+            return cursor.fetchone()[0]
+
+
 class SimulationDataManager:
+    RECENT_RUNS = 5
+
     def __init__(
         self, params: SimulationParameters, results: SimulationResults
     ):
         self.parameters = params
         self.results = results
-        self.data_file = "simulation_data.json"
-
-    def save_simulation_data(self):
-        simulation_data = {
-            'Parameters': asdict(self.parameters),
-            'Results': asdict(self.results)
-        }
+        self.data_file = "simulation_data.sqlite3"
+        self.legacy_data_file = "simulation_data.json"
 
-        existing_data = self._load_existing_data()
-        existing_data.append(simulation_data)
+    def _store(self) -> ResultsStore:
+        return ResultsStore(self.data_file, self.legacy_data_file)
 
-        self._write_data_to_file(existing_data)
+    def save_simulation_data(self):
+        self._store().append(self.parameters, self.results)
         print(
             f"{self._color_text('green')}Simulation data saved successfully."
             f"{self._color_text('reset')}\n"
         )
 
-    def _load_existing_data(self) -> list:
-        if not os.path.exists(self.data_file):
-            return []
-
-        try:
-            with open(self.data_file, 'r') as file:
-                data = json.load(file)
-                return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
+    def load_and_display_data(self):
+        """
+        Prints how many stored runs, this one included once saved, share
+        these world parameters, and the most recent RECENT_RUNS of them.
+        """
+        world = {
+            name: getattr(self.parameters, name) for name in WORLD_COLUMNS
+        }
+        store = self._store()
+        count = store.count(**world)
+        shown = min(count, self.RECENT_RUNS)
+        print(
+            f"{self._color_text('blue')}{count} stored runs with these "
+            f"parameters, the last {shown}:{self._color_text('reset')}"
+        )
+        for _, results in store.iter_runs(last=self.RECENT_RUNS, **world):
             print(
-                f"{self._color_text('yellow')}Warning: Unable to load existing data. "
-                f"Starting with fresh data.{self._color_text('reset')}"
+                f"  {results.duration or '0 Months'}: "
+                f"peak Erbast {results.max_erbast_population}, "
+                f"peak Carviz {results.max_carviz_population}, "
+                f"hunts {results.total_hunts}"
             )
-            return []
-
-    def _write_data_to_file(self, data: list):
-        with open(self.data_file, "w") as file:
-            json.dump(data, file, indent=2, cls=NumpyEncoder)
-
-    def load_and_display_data(self):
-        self.content = self._load_existing_data()
 
     @staticmethod
     def _color_text(color: str) -> str:
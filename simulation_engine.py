@@ -0,0 +1,508 @@
+import random
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from simulation_controller import SimulationController
+from creatures import Carviz, Erbast
+from constants import (
+    MAX_DAYS,
+    NEIGHBORHOOD_E,
+    NEIGHBORHOOD_C,
+    SEEDING_DISTRIBUTIONS,
+    SEED_CLUSTERS,
+    SEED_CLUSTER_SPREAD,
+    WATER,
+)
+from neighbors import OFFSETS
+from simulation_data_manager import (
+    SimulationParameters,
+    SimulationResults,
+    SimulationDataManager,
+)
+from world_state import WorldState
+from population_tracker import PopulationTracker
+from time_series import TimeSeries
+from tiled_controller import TiledSimulationController
+
+
+@dataclass(frozen=True)
+class SimulationSnapshot:
+    """Immutable view of the world after one tick, safe to hand to the GUI."""
+
+    day: int
+    duration_title: str
+    color_map: np.ndarray
+    erbast_count: int
+    carviz_count: int
+    erbast_peak: int
+    carviz_peak: int
+    total_hunts: int
+    time_data: np.ndarray
+    erbast_population_data: np.ndarray
+    carviz_population_data: np.ndarray
+
+
+class SimulationEngine:
+    """
+    SimulationEngine owns the world and advances it one day at a time,
+    without any dependency on PyQt5 or matplotlib.
+    """
+
+    # Chance that a cell joins a growing lake, by its number of lake
+    # neighbors: each of them floods it with probability 0.2 per round.
+    LAKE_GROWTH = 1 - 0.8 ** np.arange(9)
+
+    def __init__(
+        self,
+        params: SimulationParameters,
+        max_days=MAX_DAYS,
+        seed=None,
+        tiles=None,
+        erbast_radius=NEIGHBORHOOD_E,
+        carviz_radius=NEIGHBORHOOD_C,
+        distribution="uniform",
+        double_buffered=False,
+    ):
+        if tiles and max(erbast_radius, carviz_radius) > 1:
+            raise ValueError(
+                "Tiled simulations only support a perception radius of 1"
+            )
+        if tiles and double_buffered:
+            raise ValueError("Tiled simulations cannot be double-buffered")
+        if distribution not in SEEDING_DISTRIBUTIONS:
+            raise ValueError(f"Unknown seeding distribution {distribution!r}")
+        self.parameters = params
+        self.grid_size = params.grid_size
+        self.initial_carviz = params.initial_carviz_count
+        self.initial_erbast = params.initial_erbast_count
+        self.carviz_lifespan = params.carviz_lifespan
+        self.erbast_lifespan = params.erbast_lifespan
+        self.water_density = params.water_coverage
+        self.max_days = max_days
+        self.seed = seed
+        self.tiles = tiles
+        self.erbast_radius = erbast_radius
+        self.carviz_radius = carviz_radius
+        self.distribution = distribution
+        self.double_buffered = double_buffered
+
+        self.current_day = 0
+        self.erbast_count = 0
+        self.carviz_count = 0
+        self.hunt_count = 0
+        capacity = min(max_days + 1, 1 << 16)
+        self.time_history = TimeSeries(capacity)
+        self.erbast_history = TimeSeries(capacity)
+        self.carviz_history = TimeSeries(capacity)
+        self.hunt_history = TimeSeries(capacity)
+        self._record_day()
+        self.simulation_completed = False
+
+        self.world = None
+        self.population_tracker = None
+        self.grid = None
+        self.water_map = None
+        self.color_map = None
+        self.simulation_controller = None
+        self.state_manager = None
+        self.recorder = None
+
+    def initialize(self):
+        if self.seed is not None:
+            random.seed(self.seed)
+            np.random.seed(self.seed)
+        self._initialize_data_structures()
+        self.initialize_grid()
+        self._populate_creatures()
+        if self.tiles:
+            self._start_tiles(self.seed)
+        self.update_population_statistics()
+
+    def _start_tiles(self, seed):
+        """
+        Hands the world to a TiledSimulationController. From here on the
+        tiles own every creature; the engine keeps terrain and statistics.
+        """
+        controller = TiledSimulationController(
+            self.world_state(), self.grid, self.tiles, seed
+        )
+        self.simulation_controller = controller
+        self.population_tracker = controller
+        self.color_map = controller.refresh_color_map()
+        self.grid = None
+
+    def _initialize_data_structures(self):
+        self.world = WorldState(self.grid_size, self.grid_size)
+        self.water_map = np.zeros((self.grid_size, self.grid_size), dtype=bool)
+
+    def initialize_grid(self):
+        self._generate_landscape()
+        self._place_water_bodies()
+
+    def _generate_landscape(self):
+        total_cells = self.grid_size * self.grid_size
+        water_cells = int(total_cells * self.water_density / 100)
+        num_water_bodies = random.randint(2, 4)
+        water_body_sizes = self._distribute_water_cells(
+            water_cells, num_water_bodies
+        )
+
+        for size in water_body_sizes:
+            if size:
+                center = (
+                    random.randrange(self.grid_size),
+                    random.randrange(self.grid_size),
+                )
+                self._create_water_body(center, size)
+
+        ground = ~self.water_map
+        self.world.density[ground] = np.random.randint(
+            1, 100, size=int(ground.sum())
+        )
+
+    @staticmethod
+    def _distribute_water_cells(total_cells, num_bodies):
+        sizes = [
+            random.randint(1, max(1, total_cells // num_bodies))
+            for _ in range(num_bodies)
+        ]
+        total = sum(sizes)
+        return [int(size * total_cells / total) for size in sizes]
+
+    def _create_water_body(self, center, size):
+        """
+        Grows a lake of `size` new water cells from `center`. Each round,
+        every cell bordering the lake joins it with a probability that rises
+        with its number of lake neighbors (out of 8); the last round keeps a
+        random subset so the lake adds exactly `size` cells, unless it fills
+        the whole grid first. Only the lake's bounding box plus a one-cell
+        margin is touched.
+        """
+        row, column = center
+        body = np.zeros(self.water_map.shape, dtype=bool)
+        body[row, column] = True
+        top, bottom, left, right = row, row + 1, column, column + 1
+        remaining = size - (not self.water_map[row, column])
+        self.water_map[row, column] = True
+
+        while remaining > 0:
+            top, left = max(top - 1, 0), max(left - 1, 0)
+            bottom = min(bottom + 1, self.grid_size)
+            right = min(right + 1, self.grid_size)
+            window = body[top:bottom, left:right]
+            padded = np.pad(window, 1).view(np.uint8)
+            lake_neighbors = np.zeros(window.shape, dtype=np.uint8)
+            for di, dj in OFFSETS:
+                lake_neighbors += padded[
+                    1 + di : 1 + di + window.shape[0],
+                    1 + dj : 1 + dj + window.shape[1],
+                ]
+            frontier = (lake_neighbors > 0) & ~window
+            if not frontier.any():
+                break
+            joined = frontier & (
+                np.random.random(window.shape)
+                < self.LAKE_GROWTH[lake_neighbors]
+            )
+            water = self.water_map[top:bottom, left:right]
+            new_water = joined & ~water
+            added = int(new_water.sum())
+            if added > remaining:
+                keep = np.random.choice(
+                    np.flatnonzero(new_water), remaining, replace=False
+                )
+                joined = np.zeros_like(window)
+                joined.flat[keep] = True
+                added = remaining
+            window |= joined
+            water |= joined
+            remaining -= added
+
+    def _place_water_bodies(self):
+        self.world.terrain[self.water_map] = WATER
+        self.attach_world(self.world, with_creatures=False)
+
+    def attach_world(self, world, with_creatures=True):
+        """Builds the grid, tracker and controller for `world`."""
+        self.world = world
+        self.population_tracker = PopulationTracker(world.terrain)
+        self.color_map = self.population_tracker.color_map
+        self.grid = world.to_grid(
+            with_creatures=with_creatures, tracker=self.population_tracker
+        )
+        self.simulation_controller = SimulationController(
+            world,
+            self.population_tracker,
+            self.erbast_radius,
+            self.carviz_radius,
+            self.double_buffered,
+        )
+        self.simulation_controller.instrumented = self.recorder is not None
+
+    def world_state(self):
+        """Returns the WorldState with its creature tables brought up to date."""
+        if self.grid is None:
+            return self.simulation_controller.gather_world_state(self.world)
+        self.world.capture_creatures(self.grid)
+        return self.world
+
+    def close(self):
+        if self.grid is None:
+            self.simulation_controller.close()
+
+    def _populate_creatures(self):
+        self.seed_creatures(Carviz, self.initial_carviz, self.carviz_lifespan)
+        self.seed_creatures(Erbast, self.initial_erbast, self.erbast_lifespan)
+
+    def seed_creatures(self, creature_cls, count, lifetime, distribution=None):
+        """
+        Adds `count` new Erbast or Carviz to the grid, drawing every position
+        at once from the eligible cells: any ground cell for Carviz, which
+        may share one, and distinct ground cells without a herd for Erbast.
+        Raises ValueError if there are not enough eligible cells.
+        """
+        unique = creature_cls is Erbast
+        eligible = self.world.terrain != WATER
+        if unique:
+            eligible &= self.population_tracker.erbast_population == 0
+        cells = self._sample_cells(
+            np.flatnonzero(eligible),
+            count,
+            unique,
+            distribution or self.distribution,
+        )
+        energies = np.random.randint(35, 95, size=count).tolist()
+        grid = self.grid.ravel()
+        for index, energy in zip(cells.tolist(), energies):
+            cell = grid[index]
+            creature = creature_cls(lifetime=lifetime, energy=energy)
+            creature.row, creature.column = cell.row, cell.column
+            if unique:
+                cell.erbast.append(creature)
+            else:
+                cell.append_pride(creature)
+
+    def _sample_cells(self, cells, count, unique, distribution):
+        """
+        Draws `count` flat cell indices from `cells`, without replacement if
+        `unique`. "clustered" favours cells near a few random centres.
+        """
+        if (count > len(cells)) if unique else (count and not len(cells)):
+            raise ValueError(
+                f"Cannot place {count} creatures on "
+                f"{len(cells)} eligible cells"
+            )
+        if not count:
+            return cells[:0]
+        if distribution == "uniform":
+            return np.random.choice(cells, count, replace=not unique)
+        weights = self._cluster_weights(cells)
+        if not unique:
+            return np.random.choice(cells, count, p=weights / weights.sum())
+        # Weighted sampling without replacement (Efraimidis-Spirakis): keep
+        # the `count` largest keys u ** (1 / weight), compared as logs.
+        keys = np.log(np.random.random(len(cells))) / weights
+        return cells[np.argpartition(keys, len(cells) - count)[-count:]]
+
+    def _cluster_weights(self, cells):
+        centers = np.random.choice(
+            cells, min(SEED_CLUSTERS, len(cells)), replace=False
+        )
+        rows, columns = np.divmod(cells, self.grid_size)
+        spread = max(1.0, SEED_CLUSTER_SPREAD * self.grid_size)
+        weights = np.zeros(len(cells))
+        for row, column in zip(*np.divmod(centers, self.grid_size)):
+            distance = (rows - row) ** 2 + (columns - column) ** 2
+            weights += 1 / (1 + distance / spread**2) ** 2
+        return weights
+
+    def instrument(self, recorder):
+        """
+        Sends a TickRecord for every following day to `recorder`; None
+        switches instrumentation off again.
+        """
+        if recorder is not None and self.tiles:
+            raise ValueError("Tiled simulations cannot be instrumented")
+        self.recorder = recorder
+        if self.simulation_controller is not None:
+            self.simulation_controller.instrumented = recorder is not None
+
+    def step(self):
+        self.simulation_controller.simulate(self.grid)
+        self.update_population_statistics()
+        self._update_simulation_data()
+        if self.recorder is not None:
+            self.recorder.record(
+                replace(
+                    self.simulation_controller.last_record,
+                    day=self.current_day,
+                )
+            )
+
+    def run(self, days=None):
+        """Advances the simulation until it ends or `days` days have passed."""
+        target_day = self.max_days if days is None else self.current_day + days
+        reason = self.end_reason()
+        while reason is None and self.current_day < target_day:
+            self.step()
+            reason = self.end_reason()
+        return reason
+
+    def update_population_statistics(self):
+        tracker = self.population_tracker
+        self.erbast_count = tracker.erbast_cells
+        self.carviz_count = tracker.carviz_cells
+        self.hunt_count = tracker.shared_cells
+
+    def _update_simulation_data(self):
+        self.current_day += 1
+        self._record_day()
+
+    def _record_day(self):
+        self.time_history.append(self.current_day)
+        self.erbast_history.append(self.erbast_count)
+        self.carviz_history.append(self.carviz_count)
+        self.hunt_history.append(self.hunt_count)
+
+    @property
+    def erbast_population_data(self):
+        return self.erbast_history.values
+
+    @property
+    def carviz_population_data(self):
+        return self.carviz_history.values
+
+    @property
+    def time_data(self):
+        return self.time_history.values
+
+    @property
+    def erbast_peak(self):
+        return self.erbast_history.peak
+
+    @property
+    def carviz_peak(self):
+        return self.carviz_history.peak
+
+    @property
+    def total_hunts(self):
+        return self.hunt_history.total
+
+    def snapshot(self):
+        if self.grid is None:
+            self.simulation_controller.refresh_color_map()
+        color_map = self.color_map.astype(np.uint8)
+        # History buffers are append-only, so views of the recorded prefix
+        # never change; they are only marked read-only.
+        series = [
+            self.time_data,
+            self.erbast_population_data,
+            self.carviz_population_data,
+        ]
+        for array in [color_map] + series:
+            array.setflags(write=False)
+        return SimulationSnapshot(
+            self.current_day,
+            self.duration_title,
+            color_map,
+            self.erbast_count,
+            self.carviz_count,
+            self.erbast_peak,
+            self.carviz_peak,
+            self.total_hunts,
+            *series,
+        )
+
+    def end_reason(self):
+        if self.erbast_count == 0 and self.carviz_count == 0:
+            return "Both species are extinct"
+        if self.carviz_count == 0:
+            return "Carviz are extinct"
+        if self.erbast_count == 0:
+            return "Erbasts are extinct"
+        if self.current_day >= self.max_days:
+            return "Maximum simulation days reached"
+        return None
+
+    @property
+    def duration_title(self):
+        centuries, years, months = (
+            self.current_day // 1000,
+            (self.current_day % 1000) // 10,
+            self.current_day % 10,
+        )
+        time_parts = [
+            f"{centuries} Centuries" if centuries else "",
+            f"{years} Years" if years else "",
+            f"{months} Months" if months else "",
+        ]
+        return ", ".join(filter(None, time_parts))
+
+    def results(self):
+        return SimulationResults(
+            simulation_completed=True,
+            duration=self.duration_title,
+            max_carviz_population=self.carviz_peak,
+            max_erbast_population=self.erbast_peak,
+            total_hunts=self.total_hunts,
+        )
+
+    def finish(self, reason, save=True):
+        self.simulation_completed = True
+        if save:
+            self.save_results()
+        self.print_summary(reason)
+        if save:
+            self.state_manager.load_and_display_data()
+
+    def save_results(self):
+        self.state_manager = SimulationDataManager(
+            self.parameters, self.results()
+        )
+        self.state_manager.save_simulation_data()
+
+    def print_summary(self, reason):
+        print("\n\033[94m{}\033[0m".format("=" * 60))
+        print("\033[1m\033[95mSimulation Summary\033[0m")
+        print("\033[94m{}\033[0m\n".format("=" * 60))
+
+        print("\033[1m\033[96mReason for Simulation End:\033[0m {}".format(reason))
+        print(
+            "\033[1m\033[96mSimulation Duration:\033[0m {}".format(
+                self.duration_title
+            )
+        )
+
+        print("\n\033[1m\033[93mErbast Statistics:\033[0m")
+        print("  Final Population: {}".format(self.erbast_count))
+        print("  Peak Population: {}".format(self.erbast_peak))
+        print(
+            "  Survival Rate: {:.2f}%".format(
+                self._rate(self.erbast_count, self.initial_erbast)
+            )
+        )
+
+        print("\n\033[1m\033[91mCarviz Statistics:\033[0m")
+        print("  Final Population: {}".format(self.carviz_count))
+        print("  Peak Population: {}".format(self.carviz_peak))
+        print(
+            "  Survival Rate: {:.2f}%".format(
+                self._rate(self.carviz_count, self.initial_carviz)
+            )
+        )
+
+        print("\n\033[1m\033[92mEcosystem Statistics:\033[0m")
+        print("  Total Hunts: {}".format(self.total_hunts))
+        print(
+            "  Average Hunts per Day: {:.2f}".format(
+                self.total_hunts / self.current_day if self.current_day else 0
+            )
+        )
+        print("  Water Coverage: {}%".format(self.water_density))
+
+        print("\n\033[94m{}\033[0m".format("=" * 60))
+
+    @staticmethod
+    def _rate(value, total):
+        return value / total * 100 if total else 0.0
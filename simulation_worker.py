@@ -0,0 +1,50 @@
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+class SimulationWorker(QObject):
+    """
+    Runs SimulationEngine ticks on a QThread. After every tick it publishes
+    an immutable SimulationSnapshot; only the most recent one is kept, so
+    the view renders at its own frame rate and skips intermediate ticks.
+    """
+
+    finished = pyqtSignal(str)
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+        self._snapshot = engine.snapshot()
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._running.set()
+        self._stopped = False
+
+    @pyqtSlot()
+    def run(self):
+        while not self._stopped:
+            if not self._running.wait(0.05):
+                continue
+            self.engine.step()
+            snapshot = self.engine.snapshot()
+            with self._lock:
+                self._snapshot = snapshot
+            reason = self.engine.end_reason()
+            if reason is not None:
+                self.finished.emit(reason)
+                return
+
+    def latest_snapshot(self):
+        with self._lock:
+            return self._snapshot
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def stop(self):
+        self._stopped = True
+        self._running.set()
@@ -0,0 +1,182 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, asdict, fields, replace
+from typing import Iterable, Iterator, List, Optional
+
+from constants import MAX_DAYS, GRID_SIZE, MAX_LIFE_E, MAX_LIFE_C
+from simulation_data_manager import (
+    SimulationParameters,
+    SimulationResults,
+    SimulationDataManager,
+    NumpyEncoder,
+)
+from simulation_engine import SimulationEngine
+
+
+@dataclass
+class SweepResult:
+    """
+    Outcome of one run. A run that raised has end_reason "Run failed",
+    no results, and the exception in `error`.
+    """
+
+    parameters: SimulationParameters
+    seed: Optional[int]
+    end_reason: str
+    days: int
+    results: Optional[SimulationResults]
+    error: Optional[str] = None
+
+
+def expand_parameters(
+    base: SimulationParameters, **variations
+) -> List[SimulationParameters]:
+    """
+    Cartesian product of `variations` (field name -> list of values)
+    applied on top of `base`.
+    """
+    names = [field.name for field in fields(SimulationParameters)]
+    for name in variations:
+        if name not in names:
+            raise ValueError(f"Unknown simulation parameter: {name}")
+    keys = list(variations)
+    return [
+        replace(base, **dict(zip(keys, values)))
+        for values in itertools.product(*(variations[key] for key in keys))
+    ]
+
+
+def _run_single(task):
+    params, seed, days = task
+    engine = SimulationEngine(params, max_days=days, seed=seed)
+    engine.initialize()
+    reason = engine.run()
+    return SweepResult(
+        params, seed, reason, engine.current_day, engine.results()
+    )
+
+
+def _collect(future, task):
+    try:
+        return future.result()
+    except Exception as error:
+        params, seed, _ = task
+        return SweepResult(
+            params,
+            seed,
+            "Run failed",
+            0,
+            None,
+            f"{type(error).__name__}: {error}",
+        )
+
+
+def _pool_context():
+    # Forked workers start with every simulation module already imported.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def run_sweep(
+    parameter_sets: Iterable[SimulationParameters],
+    seeds: Iterable[Optional[int]] = (None,),
+    days: int = MAX_DAYS,
+    max_workers: Optional[int] = None,
+) -> Iterator[SweepResult]:
+    """
+    Runs every parameter set with every seed across a process pool and
+    yields each SweepResult as soon as its run finishes. At most
+    2 * max_workers runs are queued at any time; pool workers are reused
+    across runs. A run that raises is reported as a failed SweepResult
+    and the sweep carries on.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    seeds = list(seeds)
+    tasks = (
+        (params, seed, days)
+        for params in parameter_sets
+        for seed in seeds
+    )
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=_pool_context()
+    ) as executor:
+        pending = {}
+        for task in tasks:
+            pending[executor.submit(_run_single, task)] = task
+            if len(pending) >= 2 * max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _collect(future, pending.pop(future))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _collect(future, pending.pop(future))
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a parameter sweep of headless simulations."
+    )
+    parser.add_argument(
+        "--grid-size", type=int, nargs="+", default=[GRID_SIZE]
+    )
+    parser.add_argument("--carviz", type=int, nargs="+", default=[10])
+    parser.add_argument("--erbast", type=int, nargs="+", default=[20])
+    parser.add_argument(
+        "--carviz-lifespan", type=int, nargs="+", default=[MAX_LIFE_C]
+    )
+    parser.add_argument(
+        "--erbast-lifespan", type=int, nargs="+", default=[MAX_LIFE_E]
+    )
+    parser.add_argument("--water", type=int, nargs="+", default=[10])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[None])
+    parser.add_argument("--days", type=int, default=MAX_DAYS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="append every result to the simulation data file",
+    )
+    return parser.parse_args(argv)
+
+
+def run_sweep_cli(argv=None):
+    args = parse_arguments(argv)
+    base = SimulationParameters(
+        animation_speed=0,
+        grid_size=GRID_SIZE,
+        initial_carviz_count=10,
+        initial_erbast_count=20,
+        carviz_lifespan=MAX_LIFE_C,
+        erbast_lifespan=MAX_LIFE_E,
+        water_coverage=10,
+    )
+    parameter_sets = expand_parameters(
+        base,
+        grid_size=args.grid_size,
+        initial_carviz_count=args.carviz,
+        initial_erbast_count=args.erbast,
+        carviz_lifespan=args.carviz_lifespan,
+        erbast_lifespan=args.erbast_lifespan,
+        water_coverage=args.water,
+    )
+    results = run_sweep(parameter_sets, args.seeds, args.days, args.workers)
+    for result in results:
+        print(json.dumps(asdict(result), cls=NumpyEncoder), flush=True)
+        if args.save and result.results is not None:
+            SimulationDataManager(
+                result.parameters, result.results
+            ).save_simulation_data()
+
+
+if __name__ == "__main__":
+    run_sweep_cli()
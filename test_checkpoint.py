@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from checkpoint import save_checkpoint, load_checkpoint
+from simulation_data_manager import SimulationParameters
+from simulation_engine import SimulationEngine
+
+DAYS = 60
+
+
+def _new_engine(seed, max_days):
+    engine = SimulationEngine(
+        SimulationParameters(0, 30, 15, 40, 10, 10, 20),
+        max_days=max_days,
+        seed=seed,
+    )
+    engine.initialize()
+    return engine
+
+
+def _state(engine):
+    world = engine.world_state()
+    state = [world.density.copy()]
+    for table in (world.erbast, world.carviz):
+        state.extend(getattr(table, name).copy() for name in table.FIELDS)
+    state.append(engine.erbast_history.values.copy())
+    state.append(engine.carviz_history.values.copy())
+    return state
+
+
+@pytest.mark.parametrize("seed", range(1, 7))
+@pytest.mark.parametrize("split_day", (15, 35))
+def test_resumed_run_continues_bit_for_bit(tmp_path, seed, split_day):
+    uninterrupted = _new_engine(seed, DAYS)
+    uninterrupted.run()
+
+    first_half = _new_engine(seed, split_day)
+    first_half.run()
+    path = str(tmp_path / "checkpoint.npz")
+    save_checkpoint(first_half, path)
+    resumed = load_checkpoint(path)
+    resumed.max_days = DAYS
+    resumed.run()
+
+    assert resumed.current_day == uninterrupted.current_day
+    for expected, actual in zip(_state(uninterrupted), _state(resumed)):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_examined_kernels_survive_checkpoint(tmp_path):
+    engine = _new_engine(1, 15)
+    engine.run()
+    path = str(tmp_path / "checkpoint.npz")
+    save_checkpoint(engine, path)
+    restored = load_checkpoint(path)
+
+    saved, loaded = engine.world_state(), restored.world_state()
+    for before, after in ((saved.erbast, loaded.erbast),
+                          (saved.carviz, loaded.carviz)):
+        assert (before.kernel_row != before.NO_KERNEL).any()
+        np.testing.assert_array_equal(after.kernel_row, before.kernel_row)
+        np.testing.assert_array_equal(
+            after.kernel_column, before.kernel_column
+        )
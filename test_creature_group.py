@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pytest
+
+from creatures import Erbast
+from herd import Herd
+
+
+def test_remove_keeps_member_order():
+    rng = random.Random(0)
+    herd = Herd(0, 0)
+    expected = []
+    for _ in range(500):
+        if expected and rng.random() < 0.4:
+            erb = rng.choice(expected)
+            herd.remove(erb)
+            expected.remove(erb)
+        else:
+            erb = Erbast(energy=50)
+            herd.append(erb)
+            expected.append(erb)
+        assert list(herd) == expected
+
+
+def test_loops_behave_like_plain_lists():
+    # Removing the visited member skips the next one, and members added
+    # during a loop are visited by it.
+    herd = Herd(0, 0)
+    members = [Erbast(energy=50) for _ in range(4)]
+    herd.extend(members)
+    newborn = Erbast(energy=50)
+    visited = []
+    for erb in herd:
+        visited.append(erb)
+        if erb is members[0]:
+            herd.remove(erb)
+        if erb is members[2]:
+            herd.append(newborn)
+    assert visited == [members[0], members[2], members[3], newborn]
+
+
+def test_remove_missing_member_raises():
+    herd = Herd(0, 0)
+    herd.append(Erbast(energy=50))
+    with pytest.raises(ValueError):
+        herd.remove(Erbast(energy=50))
+
+
+class _PlainHerd(list):
+    def energy_changed(self, erb):
+        pass
+
+
+def test_aging_matches_plain_list():
+    # Members that die make the loop skip their successor, and newborns
+    # are aged on their birth day, as over the plain list Herd replaced.
+    def aged(group, age):
+        np.random.seed(0)
+        for lifetime in (1, 3, 1, 2, 1):
+            erb = Erbast(lifetime=lifetime, energy=50)
+            erb.age = lifetime - 1
+            group.append(erb)
+        age(group)
+        return [(erb.age, erb.energy, erb.lifetime) for erb in group]
+
+    def plain_aging(group):
+        for erb in group:
+            erb.aging(group)
+
+    assert aged(Herd(0, 0), Herd.group_aging) == aged(
+        _PlainHerd(), plain_aging
+    )
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda herd: herd.insert(0, Erbast(energy=50)),
+        lambda herd: herd.pop(),
+        lambda herd: herd.sort(key=id),
+        lambda herd: herd.reverse(),
+        lambda herd: herd.__setitem__(0, Erbast(energy=50)),
+        lambda herd: herd.__delitem__(0),
+        lambda herd: herd.__iadd__([Erbast(energy=50)]),
+        lambda herd: herd.__imul__(2),
+    ],
+)
+def test_unsupported_mutators_raise(mutate):
+    herd = Herd(0, 0)
+    members = [Erbast(energy=50) for _ in range(3)]
+    herd.extend(members)
+    with pytest.raises(TypeError):
+        mutate(herd)
+    herd.remove(members[0])
+    assert list(herd) == members[1:]
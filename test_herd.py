@@ -0,0 +1,115 @@
+import random
+
+import numpy as np
+import pytest
+
+from checkpoint import save_checkpoint, load_checkpoint
+from creatures import Erbast
+from herd import Herd
+from simulation_data_manager import SimulationParameters
+from simulation_engine import SimulationEngine
+from world_state import WorldState
+
+
+def _strongest_by_max(herd):
+    return max(herd, key=lambda erb: erb.energy)
+
+
+def test_strongest_matches_max_with_tied_energies():
+    rng = random.Random(1)
+    herd = Herd(0, 0)
+    herd.extend(Erbast(energy=rng.choice((40, 100))) for _ in range(20))
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.3:
+            herd.append(Erbast(energy=rng.choice((40, 99, 100))))
+        elif action < 0.6 and len(herd) > 1:
+            herd.remove(rng.choice(herd))
+        else:
+            erb = rng.choice(herd)
+            erb.energy = rng.choice((40, 99, 100))
+            herd.energy_changed(erb)
+        assert herd.strongest() is _strongest_by_max(herd)
+        if rng.random() < 0.2:
+            herd.remove(herd.strongest())
+            if not herd:
+                herd.append(Erbast(energy=100))
+
+
+def test_strongest_sees_members_added_by_extend():
+    herd = Herd(0, 0)
+    herd.append(Erbast(energy=10))
+    herd.strongest()
+    herd.extend([Erbast(energy=90)])
+    assert herd.strongest() is _strongest_by_max(herd)
+
+
+def test_strongest_survives_checkpoint_round_trip(tmp_path):
+    engine = SimulationEngine(
+        SimulationParameters(0, 30, 20, 200, 30, 10, 10),
+        max_days=40,
+        seed=3,
+    )
+    engine.initialize()
+    engine.run()
+    for row in engine.grid:
+        for cell in row:
+            if cell.erbast:
+                cell.erbast.strongest()
+    path = tmp_path / "checkpoint.npz"
+    save_checkpoint(engine, str(path))
+    resumed = load_checkpoint(str(path))
+
+    herds = 0
+    for row, resumed_row in zip(engine.grid, resumed.grid):
+        for cell, resumed_cell in zip(row, resumed_row):
+            if cell.erbast:
+                herds += 1
+                assert cell.erbast.strongest() is _strongest_by_max(
+                    cell.erbast
+                )
+                index = cell.erbast.index(cell.erbast.strongest())
+                assert resumed_cell.erbast[index] is (
+                    resumed_cell.erbast.strongest()
+                )
+    assert herds
+
+
+def _grazing_world(seed):
+    """A small world with random densities (some negative) and herds."""
+    rng = random.Random(seed)
+    world = WorldState(5, 5)
+    world.density[:] = np.array(
+        [rng.randint(-20, 100) for _ in range(25)]
+    ).reshape(5, 5)
+    grid = world.to_grid(with_creatures=False)
+    for cell in grid.ravel():
+        for _ in range(rng.choice((0, 1, 2, 5, 30, 150))):
+            erb = Erbast(
+                energy=rng.choice(
+                    (0, 12.5, 40, 40.25, rng.uniform(-5, 105), 100)
+                )
+            )
+            erb.row, erb.column = cell.row, cell.column
+            erb.has_moved = rng.random() < 0.3
+            cell.erbast.append(erb)
+    return world, grid
+
+
+@pytest.mark.parametrize("seed", range(400))
+def test_graze_herds_matches_herd_graze(seed):
+    expected_world, expected_grid = _grazing_world(seed)
+    for cell in expected_grid.ravel():
+        if cell.erbast:
+            cell.erbast.herd_graze(expected_grid)
+
+    world, grid = _grazing_world(seed)
+    Herd.graze_herds(
+        [cell.erbast for cell in grid.ravel() if cell.erbast], world.density
+    )
+
+    np.testing.assert_array_equal(world.density, expected_world.density)
+    for cell, expected_cell in zip(grid.ravel(), expected_grid.ravel()):
+        assert [erb.energy for erb in cell.erbast] == [
+            erb.energy for erb in expected_cell.erbast
+        ]
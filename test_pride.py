@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from creatures import Carviz
+from pride import Pride
+from world_state import WorldState
+
+
+def _random_grid(rng, size=6):
+    grid = WorldState(size, size).to_grid(with_creatures=False)
+    visited = [None, (0, 0), (0, 1), (1, 0), (2, 2)]
+    for row in range(size):
+        for column in range(size):
+            for _ in range(rng.choice((0, 1, 3, 8, 40))):
+                carviz = Carviz(energy=rng.choice((5.0, 30, 50.5, 90, 100)))
+                carviz.row, carviz.column = row, column
+                carviz.previously_visited = rng.choice(visited)
+                grid[row, column].append_pride(carviz)
+    return grid
+
+
+def _fights_per_cell(prides, grid):
+    """(cell index, winner, joined) from fight_between_prides calls."""
+    cells, winners, joined = [], [], []
+    for index, pride in enumerate(prides):
+        groups = Pride._group_carviz_into_prides(pride)
+        outcome = pride.fight_between_prides(pride, grid)
+        if len(groups) < 2:
+            continue
+        remaining = {
+            id(carviz)
+            for group in outcome
+            for carviz in (group if isinstance(group, Pride) else [group])
+        }
+        cells.append(index)
+        winners.append(
+            next(
+                position
+                for position, group in enumerate(groups)
+                if id(group[0]) not in remaining
+            )
+        )
+        joined.append(len(groups) > 2 and len(outcome) == 1)
+    return cells, winners, joined
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_resolve_fights_matches_per_cell_fights(seed):
+    grid = _random_grid(random.Random(seed))
+    prides = [cell.pride for cell in grid.ravel() if cell.pride]
+
+    random.seed(seed)
+    expected = _fights_per_cell(prides, grid)
+    expected_state = random.getstate()
+
+    random.seed(seed)
+    cells, winners, joined = Pride.resolve_fights(prides)
+
+    assert cells.tolist() == expected[0]
+    assert winners.tolist() == expected[1]
+    assert joined.tolist() == expected[2]
+    assert random.getstate() == expected_state
+
+
+def test_resolve_fights_without_previous_visits_has_no_fights():
+    grid = _random_grid(random.Random(0))
+    for cell in grid.ravel():
+        for carviz in cell.pride:
+            carviz.previously_visited = None
+    prides = [cell.pride for cell in grid.ravel() if cell.pride]
+    state = random.getstate()
+    cells, winners, joined = Pride.resolve_fights(prides)
+    assert len(cells) == len(winners) == len(joined) == 0
+    assert random.getstate() == state
@@ -0,0 +1,64 @@
+import json
+
+from simulation_data_manager import (
+    ResultsStore,
+    SimulationDataManager,
+    SimulationParameters,
+    SimulationResults,
+)
+
+PARAMETERS = SimulationParameters(0, 30, 1, 2, 3, 4, 5)
+
+
+def _results(months):
+    return SimulationResults(True, f"{months} Months", 1, 2, 3)
+
+
+def test_malformed_legacy_records_are_skipped(tmp_path):
+    legacy = tmp_path / "simulation_data.json"
+    good = {
+        "Parameters": vars(PARAMETERS),
+        "Results": vars(_results(1)),
+    }
+    legacy.write_text(
+        json.dumps(
+            [
+                good,
+                {"Parameters": vars(PARAMETERS)},
+                {"Results": vars(_results(2))},
+                "not a record",
+                {"Parameters": {"grid_size": 30}, "Results": {}},
+                {
+                    "Parameters": dict(vars(PARAMETERS), grid_size=None),
+                    "Results": vars(_results(3)),
+                },
+                good,
+            ]
+        )
+    )
+    store = ResultsStore(str(tmp_path / "runs.sqlite3"), str(legacy))
+
+    assert store.count() == 2
+    store.append(PARAMETERS, _results(4))
+    assert [results.duration for _, results in store.iter_runs()] == [
+        "1 Months",
+        "1 Months",
+        "4 Months",
+    ]
+
+
+def test_display_shows_the_count_and_last_runs(
+    tmp_path, capsys, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    for months in range(8):
+        manager = SimulationDataManager(PARAMETERS, _results(months))
+        manager.save_simulation_data()
+    capsys.readouterr()
+
+    SimulationDataManager(PARAMETERS, _results(7)).load_and_display_data()
+    lines = capsys.readouterr().out.splitlines()
+    assert "8 stored runs with these parameters, the last 5:" in lines[0]
+    assert [line.split(":")[0].strip() for line in lines[1:]] == [
+        f"{months} Months" for months in range(3, 8)
+    ]
@@ -0,0 +1,40 @@
+import random
+
+import numpy as np
+
+from simulation_data_manager import SimulationParameters
+from simulation_engine import SimulationEngine
+
+
+def _engine(size, seed):
+    engine = SimulationEngine(
+        SimulationParameters(0, size, 15, 40, 10, 10, 20),
+        max_days=20,
+        seed=seed,
+    )
+    engine.initialize()
+    return engine
+
+
+def _creatures(engine):
+    world = engine.world_state()
+    return [
+        getattr(table, name).copy()
+        for table in (world.erbast, world.carviz)
+        for name in ("row", "column", "energy")
+    ]
+
+
+def test_engines_do_not_share_neighbor_tables():
+    first = _engine(30, 1)
+    _engine(20, 2)
+    rng_state = random.getstate(), np.random.get_state()
+    first.run(5)
+
+    # The same world run alone, from the same RNG state.
+    alone = _engine(30, 1)
+    random.setstate(rng_state[0])
+    np.random.set_state(rng_state[1])
+    alone.run(5)
+    for expected, actual in zip(_creatures(alone), _creatures(first)):
+        np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,23 @@
+from simulation_data_manager import SimulationParameters
+from sweep import expand_parameters, run_sweep
+
+
+def test_failed_run_does_not_stop_the_sweep():
+    # 500 erbast do not fit on a 10x10 grid, so those runs raise.
+    parameter_sets = expand_parameters(
+        SimulationParameters(0, 10, 2, 4, 10, 10, 10),
+        initial_erbast_count=[4, 500, 6],
+    )
+    results = list(
+        run_sweep(parameter_sets, seeds=[1, 2], days=5, max_workers=2)
+    )
+
+    assert len(results) == 6
+    for result in results:
+        if result.parameters.initial_erbast_count == 500:
+            assert result.end_reason == "Run failed"
+            assert result.results is None
+            assert result.error.startswith("ValueError")
+        else:
+            assert result.error is None
+            assert result.results is not None
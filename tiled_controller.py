@@ -0,0 +1,387 @@
+import bisect
+import multiprocessing
+import random
+
+import numpy as np
+
+from cell import Cell
+from constants import WATER
+from population_tracker import PopulationTracker
+from simulation_controller import SimulationController
+from world_state import WorldState, VegetobView
+
+
+class HaloCell(Cell):
+    """
+    Ghost cell mirroring a neighbor tile's edge. It reports that tile's
+    populations from the last halo exchange plus any creatures that moved
+    in during this tick.
+    """
+
+    __slots__ = ("halo_erbast", "halo_carviz")
+
+    def __init__(self, row, column, terrain_type, vegetob, tracker=None):
+        super().__init__(row, column, terrain_type, vegetob, tracker)
+        self.halo_erbast = 0
+        self.halo_carviz = 0
+
+    def len_of_erbast(self):
+        return self.halo_erbast + len(self.erbast)
+
+    def len_of_carviz(self):
+        return self.halo_carviz + len(self.pride)
+
+
+def _ring(top, left, height, width):
+    """Coordinates of the one-cell ring around a height x width block."""
+    rows = list(range(top - 1, top + height + 1))
+    cols = list(range(left, left + width))
+    coords = [(top - 1, col) for col in cols]
+    coords += [(top + height, col) for col in cols]
+    coords += [(row, left - 1) for row in rows]
+    coords += [(row, left + width) for row in rows]
+    return coords
+
+
+def _edge(top, left, height, width):
+    """Coordinates of the outermost one-cell band of a block."""
+    return sorted(
+        {
+            (row, col)
+            for row in range(top, top + height)
+            for col in range(left, left + width)
+            if row in (top, top + height - 1)
+            or col in (left, left + width - 1)
+        }
+    )
+
+
+def _as_index(coords):
+    rows, cols = zip(*coords) if coords else ((), ())
+    return np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+
+
+class Tile:
+    """
+    One rectangular piece of the world, simulated in its own process on a
+    local grid with a one-cell ring of HaloCells around it. Local
+    coordinate (1, 1) is global (top, left).
+    """
+
+    def __init__(self, top, left, terrain, density, creatures, seed):
+        self.top, self.left = top, left
+        height, width = terrain.shape[0] - 2, terrain.shape[1] - 2
+        random.seed(int(seed.generate_state(1)[0]))
+        np.random.seed(seed.generate_state(4))
+
+        self.world = WorldState(height + 2, width + 2)
+        self.world.terrain[:] = terrain
+        self.world.density[:] = density
+        self.tracker = PopulationTracker(self.world.terrain)
+        self.grid = self.world.to_grid(
+            with_creatures=False, tracker=self.tracker
+        )
+        ghosts = _ring(1, 1, height, width)
+        for row, col in ghosts:
+            ground = self.world.terrain[row, col] != WATER
+            self.grid[row, col] = HaloCell(
+                row,
+                col,
+                "Ground" if ground else "Water",
+                VegetobView(self.world.density, row, col) if ground else None,
+                self.tracker,
+            )
+        self.ghost_index = _as_index(ghosts)
+        self.edge_index = _as_index(_edge(1, 1, height, width))
+        self.ghost_cells = [self.grid[row, col] for row, col in ghosts]
+
+        self.controller = SimulationController(self.world, self.tracker)
+        self.arrive(creatures)
+
+    def arrive(self, creatures):
+        """Places creatures given in global coordinates on the local grid."""
+        rows, columns = self.world.shape
+        for kind, creature in creatures:
+            self._shift(creature, 1 - self.top, 1 - self.left)
+            if creature.kernel_row is not None and not (
+                0 <= creature.kernel_row < rows
+                and 0 <= creature.kernel_column < columns
+            ):
+                # The examined cell is not on this tile's grid.
+                creature.kernel_row = creature.kernel_column = None
+            cell = self.grid[creature.row, creature.column]
+            if kind == "erbast":
+                cell.erbast.append(creature)
+            else:
+                cell.append_pride(creature)
+
+    @staticmethod
+    def _shift(creature, d_row, d_col):
+        creature.row += d_row
+        creature.column += d_col
+        if creature.kernel_row is not None:
+            creature.kernel_row += d_row
+            creature.kernel_column += d_col
+        previous = getattr(creature, "previous_position", None)
+        if previous is not None:
+            creature.previous_position = (
+                previous[0] + d_row,
+                previous[1] + d_col,
+            )
+
+    def begin_tick(self, halo):
+        density, erbast, carviz = halo
+        self.world.density[self.ghost_index] = density
+        for cell, n_erbast, n_carviz in zip(
+            self.ghost_cells, erbast.tolist(), carviz.tolist()
+        ):
+            cell.halo_erbast, cell.halo_carviz = n_erbast, n_carviz
+        self.controller.simulate_movement(self.grid)
+        return self._collect_emigrants()
+
+    def _collect_emigrants(self):
+        emigrants = []
+        for cell in self.ghost_cells:
+            groups = (("erbast", cell.erbast), ("carviz", cell.pride))
+            for kind, group in groups:
+                for creature in group:
+                    self._shift(creature, self.top - 1, self.left - 1)
+                    emigrants.append((kind, creature))
+                group.clear()
+        return emigrants
+
+    def end_tick(self, immigrants):
+        self.arrive(immigrants)
+        self.controller.simulate_interactions(self.grid)
+        # Offspring and dead creatures never leave their cell, so the ghost
+        # ring is still empty here.
+        border = (
+            self.world.density[self.edge_index],
+            self.tracker.erbast_population[self.edge_index],
+            self.tracker.carviz_population[self.edge_index],
+        )
+        counts = (
+            self.tracker.erbast_cells,
+            self.tracker.carviz_cells,
+            self.tracker.shared_cells,
+        )
+        return border, counts
+
+    def interior(self, array):
+        return array[1:-1, 1:-1]
+
+    def world_state(self):
+        """Interior densities and creatures, in global coordinates."""
+        self.world.capture_creatures(self.grid)
+        for table in (self.world.erbast, self.world.carviz):
+            table.row += self.top - 1
+            table.column += self.left - 1
+            examined = table.kernel_row != table.NO_KERNEL
+            table.kernel_row[examined] += self.top - 1
+            table.kernel_column[examined] += self.left - 1
+        return (
+            self.interior(self.world.density).copy(),
+            self.world.erbast,
+            self.world.carviz,
+        )
+
+
+def _tile_main(connection, *tile_args):
+    tile = Tile(*tile_args)
+    handlers = {
+        "begin": tile.begin_tick,
+        "end": tile.end_tick,
+        "colors": lambda _: tile.interior(tile.tracker.color_map).copy(),
+        "state": lambda _: tile.world_state(),
+    }
+    while True:
+        command, payload = connection.recv()
+        if command == "stop":
+            connection.close()
+            return
+        connection.send(handlers[command](payload))
+
+
+class TiledSimulationController:
+    """
+    Runs the simulation on a world split into tiles, one worker process per
+    tile. Every tick, tiles receive a one-cell halo of density and
+    occupancy from their neighbors, run the movement phases, hand creatures
+    that crossed a tile edge to the owning tile, then run the remaining
+    phases. Each tile draws from its own RNG stream spawned from `seed`,
+    so a run is reproducible for a given seed and tiling.
+    """
+
+    def __init__(self, world, grid, tiles=(2, 2), seed=None):
+        self.shape = world.shape
+        self.color_map = np.zeros(self.shape)
+        self._halo_density = world.density.astype(np.int16)
+        self._halo_erbast, self._halo_carviz = world.population_maps()
+        has_erbast, has_carviz = self._halo_erbast > 0, self._halo_carviz > 0
+        self.erbast_cells = int(has_erbast.sum())
+        self.carviz_cells = int(has_carviz.sum())
+        self.shared_cells = int((has_erbast & has_carviz).sum())
+
+        row_bounds = self._bounds(self.shape[0], tiles[0])
+        col_bounds = self._bounds(self.shape[1], tiles[1])
+        self._row_bounds, self._col_bounds = row_bounds, col_bounds
+        self._row_starts = [top for top, _ in row_bounds]
+        self._col_starts = [left for left, _ in col_bounds]
+        seeds = np.random.SeedSequence(seed).spawn(
+            len(row_bounds) * len(col_bounds)
+        )
+        creatures = self._creatures_by_tile(grid)
+
+        context = multiprocessing.get_context(
+            "fork"
+            if "fork" in multiprocessing.get_all_start_methods()
+            else None
+        )
+        self._tiles = []
+        for top, bottom in row_bounds:
+            for left, right in col_bounds:
+                terrain, density = self._padded_slices(
+                    world, top, bottom, left, right
+                )
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_tile_main,
+                    args=(
+                        child,
+                        top,
+                        left,
+                        terrain,
+                        density,
+                        creatures[len(self._tiles)],
+                        seeds[len(self._tiles)],
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                height, width = bottom - top, right - left
+                ghosts = [
+                    (row, col)
+                    for row, col in _ring(top, left, height, width)
+                    if 0 <= row < self.shape[0] and 0 <= col < self.shape[1]
+                ]
+                self._tiles.append(
+                    {
+                        "process": process,
+                        "connection": parent,
+                        "ghost_global": _as_index(ghosts),
+                        "ghost_mask": np.array(
+                            [
+                                0 <= row < self.shape[0]
+                                and 0 <= col < self.shape[1]
+                                for row, col in _ring(top, left, height, width)
+                            ]
+                        ),
+                        "edge_global": _as_index(
+                            _edge(top, left, height, width)
+                        ),
+                        "bounds": (top, bottom, left, right),
+                    }
+                )
+
+    @staticmethod
+    def _bounds(size, parts):
+        edges = np.linspace(0, size, max(1, min(parts, size)) + 1).astype(int)
+        return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+    def _tile_of(self, row, col):
+        """Index in self._tiles of the tile owning global cell (row, col)."""
+        tile_row = bisect.bisect_right(self._row_starts, row) - 1
+        tile_col = bisect.bisect_right(self._col_starts, col) - 1
+        return tile_row * len(self._col_bounds) + tile_col
+
+    def _creatures_by_tile(self, grid):
+        creatures = [
+            [] for _ in range(len(self._row_bounds) * len(self._col_bounds))
+        ]
+        for row in grid:
+            for cell in row:
+                owner = creatures[self._tile_of(cell.row, cell.column)]
+                owner.extend(("erbast", erbast) for erbast in cell.erbast)
+                owner.extend(("carviz", carviz) for carviz in cell.pride)
+        return creatures
+
+    def _padded_slices(self, world, top, bottom, left, right):
+        rows, cols = self.shape
+        terrain = np.full(
+            (bottom - top + 2, right - left + 2), WATER, dtype=np.uint8
+        )
+        density = np.zeros(terrain.shape, dtype=np.int16)
+        src_top, src_bottom = max(top - 1, 0), min(bottom + 1, rows)
+        src_left, src_right = max(left - 1, 0), min(right + 1, cols)
+        dst = (
+            slice(src_top - top + 1, src_bottom - top + 1),
+            slice(src_left - left + 1, src_right - left + 1),
+        )
+        src = (slice(src_top, src_bottom), slice(src_left, src_right))
+        terrain[dst] = world.terrain[src]
+        density[dst] = world.density[src]
+        return terrain, density
+
+    def _halo(self, tile):
+        mask, index = tile["ghost_mask"], tile["ghost_global"]
+        halo = []
+        canvases = (self._halo_density, self._halo_erbast, self._halo_carviz)
+        for canvas in canvases:
+            values = np.zeros(len(mask), dtype=canvas.dtype)
+            values[mask] = canvas[index]
+            halo.append(values)
+        return tuple(halo)
+
+    def simulate(self, cells_list=None):
+        for tile in self._tiles:
+            tile["connection"].send(("begin", self._halo(tile)))
+        emigrants = [tile["connection"].recv() for tile in self._tiles]
+
+        immigrants = [[] for _ in self._tiles]
+        for batch in emigrants:
+            for kind, creature in batch:
+                owner = self._tile_of(creature.row, creature.column)
+                immigrants[owner].append((kind, creature))
+
+        for tile, arrivals in zip(self._tiles, immigrants):
+            tile["connection"].send(("end", arrivals))
+        self.erbast_cells = self.carviz_cells = self.shared_cells = 0
+        for tile in self._tiles:
+            border, counts = tile["connection"].recv()
+            edge = tile["edge_global"]
+            self._halo_density[edge] = border[0]
+            self._halo_erbast[edge] = border[1]
+            self._halo_carviz[edge] = border[2]
+            self.erbast_cells += counts[0]
+            self.carviz_cells += counts[1]
+            self.shared_cells += counts[2]
+
+    def _gather(self, command):
+        for tile in self._tiles:
+            tile["connection"].send((command, None))
+        return [
+            (tile["bounds"], tile["connection"].recv()) for tile in self._tiles
+        ]
+
+    def refresh_color_map(self):
+        for (top, bottom, left, right), colors in self._gather("colors"):
+            self.color_map[top:bottom, left:right] = colors
+        return self.color_map
+
+    def gather_world_state(self, world):
+        """Copies densities and creatures from every tile into `world`."""
+        erbasts, carvizes = [], []
+        for (top, bottom, left, right), state in self._gather("state"):
+            density, erbast, carviz = state
+            world.density[top:bottom, left:right] = density
+            erbasts.append(erbast)
+            carvizes.append(carviz)
+        world.erbast = type(world.erbast).concatenate(erbasts)
+        world.carviz = type(world.carviz).concatenate(carvizes)
+        return world
+
+    def close(self):
+        for tile in self._tiles:
+            tile["connection"].send(("stop", None))
+            tile["process"].join()
+        self._tiles = []
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class TimeSeries:
+    """
+    Growable, preallocated buffer for one per-day series. Appends are
+    amortized O(1) and the running peak and total are kept alongside.
+    """
+
+    def __init__(self, capacity=1024, dtype=np.int64):
+        self._data = np.zeros(max(capacity, 1), dtype=dtype)
+        self._size = 0
+        self.peak = 0
+        self.total = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    @property
+    def values(self):
+        """View of the recorded values; valid until the next append."""
+        return self._data[: self._size]
+
+    def append(self, value):
+        if self._size == len(self._data):
+            grown = np.zeros(2 * len(self._data), dtype=self._data.dtype)
+            grown[: self._size] = self._data
+            self._data = grown
+        self._data[self._size] = value
+        self._size += 1
+        if self._size == 1 or value > self.peak:
+            self.peak = value
+        self.total += value
+
+    @classmethod
+    def from_values(cls, values, dtype=np.int64):
+        values = np.asarray(values, dtype=dtype)
+        series = cls(len(values), dtype)
+        series._data[: len(values)] = values
+        series._size = len(values)
+        if len(values):
+            series.peak = values.max().item()
+            series.total = values.sum().item()
+        return series
@@ -0,0 +1,197 @@
+import gc
+
+import numpy as np
+
+from cell import Cell
+from creatures import Creatures, Vegetob, Erbast, Carviz
+from constants import GROUND, WATER
+
+
+class VegetobView(Vegetob):
+    """Vegetob whose density is stored in a WorldState density array."""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, density_store, row, column):
+        # Vegetob.__init__ would write a zero density into the store.
+        Creatures.__init__(self)
+        self._store = density_store
+        self.row, self.column = row, column
+
+    @property
+    def density(self):
+        return int(self._store[self.row, self.column])
+
+    @density.setter
+    def density(self, new_density):
+        self._store[self.row, self.column] = int(new_density)
+
+
+class CreatureTable:
+    """
+    Contiguous per-creature columns for one species. This is a snapshot
+    and serialization format (checkpoints, tile handoff, grid rebuilds),
+    not the live store: the simulation reads and writes the Erbast and
+    Carviz objects. `kernel_row` and `kernel_column` hold the cell whose
+    neighbors the creature examined last, or NO_KERNEL if it has not
+    examined any.
+    """
+
+    FIELDS = (
+        "row",
+        "column",
+        "energy",
+        "age",
+        "lifetime",
+        "kernel_row",
+        "kernel_column",
+    )
+    NO_KERNEL = -1
+
+    def __init__(self, size=0):
+        self.row = np.zeros(size, dtype=np.int32)
+        self.column = np.zeros(size, dtype=np.int32)
+        self.energy = np.zeros(size, dtype=np.float64)
+        self.age = np.zeros(size, dtype=np.int32)
+        self.lifetime = np.zeros(size, dtype=np.int32)
+        self.kernel_row = np.full(size, self.NO_KERNEL, dtype=np.int32)
+        self.kernel_column = np.full(size, self.NO_KERNEL, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.row)
+
+    @classmethod
+    def from_creatures(cls, creatures):
+        creatures = list(creatures)
+        table = cls(len(creatures))
+        for idx, creature in enumerate(creatures):
+            table.row[idx] = creature.row
+            table.column[idx] = creature.column
+            table.energy[idx] = creature.energy
+            table.age[idx] = creature.age
+            table.lifetime[idx] = creature.lifetime
+            if creature.kernel_row is not None:
+                table.kernel_row[idx] = creature.kernel_row
+                table.kernel_column[idx] = creature.kernel_column
+        return table
+
+    @classmethod
+    def concatenate(cls, tables):
+        table = cls()
+        for name in cls.FIELDS:
+            setattr(
+                table,
+                name,
+                np.concatenate([getattr(part, name) for part in tables])
+                if tables
+                else getattr(table, name),
+            )
+        return table
+
+    def to_creatures(self, creature_cls):
+        creatures = []
+        columns = zip(*(getattr(self, name).tolist() for name in self.FIELDS))
+        for row, column, energy, age, lifetime, kernel_row, kernel_column in (
+            columns
+        ):
+            creature = creature_cls(lifetime=lifetime, energy=energy)
+            creature.row, creature.column = row, column
+            creature.age = age
+            if kernel_row != self.NO_KERNEL:
+                creature.kernel_row = kernel_row
+                creature.kernel_column = kernel_column
+            creatures.append(creature)
+        return creatures
+
+
+class WorldState:
+    """
+    Structure-of-arrays store for the world. Terrain codes and vegetob
+    densities are the live 2D arrays the simulation works on. Creatures
+    still live as objects in the Cell grid; the CreatureTables are
+    snapshots of them, refreshed by capture_creatures.
+    """
+
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.terrain = np.full((rows, columns), GROUND, dtype=np.uint8)
+        self.density = np.zeros((rows, columns), dtype=np.int16)
+        self.erbast = CreatureTable()
+        self.carviz = CreatureTable()
+
+    @property
+    def shape(self):
+        return self.rows, self.columns
+
+    @property
+    def ground_mask(self):
+        return self.terrain == GROUND
+
+    @classmethod
+    def from_grid(cls, grid):
+        rows, columns = len(grid), len(grid[0])
+        state = cls(rows, columns)
+        for row in range(rows):
+            for column in range(columns):
+                cell = grid[row][column]
+                if cell.terrain_type == "Water":
+                    state.terrain[row, column] = WATER
+                else:
+                    state.density[row, column] = cell.vegetob.density
+        state.capture_creatures(grid)
+        return state
+
+    def capture_creatures(self, grid):
+        """Refreshes the creature tables from the creatures held by `grid`."""
+        erbasts, carvizes = [], []
+        for row in grid:
+            for cell in row:
+                erbasts.extend(cell.erbast)
+                carvizes.extend(cell.pride)
+        self.erbast = CreatureTable.from_creatures(erbasts)
+        self.carviz = CreatureTable.from_creatures(carvizes)
+
+    def to_grid(self, with_creatures=True, tracker=None):
+        """
+        Builds the Cell grid used by SimulationController. Ground cells get a
+        VegetobView, so densities written by the controller land directly in
+        `self.density`. If a PopulationTracker is given, every cell reports
+        arrivals and departures to it.
+        """
+        cells = []
+        append = cells.append
+        density = self.density
+        # None of the new cells is garbage, but each allocation burst would
+        # still trigger collector passes over every cell built so far.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for row, terrain_row in enumerate(self.terrain.tolist()):
+                for column, terrain in enumerate(terrain_row):
+                    if terrain == WATER:
+                        append(Cell(row, column, "Water", None, tracker))
+                    else:
+                        vegetob = VegetobView(density, row, column)
+                        append(
+                            Cell(row, column, "Ground", vegetob, tracker)
+                        )
+        finally:
+            if collecting:
+                gc.enable()
+        grid = np.empty(len(cells), dtype=object)
+        grid[:] = cells
+        grid = grid.reshape(self.shape)
+        if with_creatures:
+            for erbast in self.erbast.to_creatures(Erbast):
+                grid[erbast.row, erbast.column].erbast.append(erbast)
+            for carviz in self.carviz.to_creatures(Carviz):
+                grid[carviz.row, carviz.column].append_pride(carviz)
+        return grid
+
+    def population_maps(self):
+        erbast_map = np.zeros(self.shape, dtype=np.int32)
+        carviz_map = np.zeros(self.shape, dtype=np.int32)
+        np.add.at(erbast_map, (self.erbast.row, self.erbast.column), 1)
+        np.add.at(carviz_map, (self.carviz.row, self.carviz.column), 1)
+        return erbast_map, carviz_map